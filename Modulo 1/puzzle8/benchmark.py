@@ -0,0 +1,200 @@
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from model.board import Tablero, desrango
+from model.oraculo import Oraculo
+from controller.solver import HEURISTICAS, SOLVERS
+
+# Banco de pruebas de los resolvedores del 8-puzzle.
+#
+# Genera (con semilla) instancias resolubles estratificadas por su distancia
+# óptima, que se lee del oráculo, y ejecuta cada combinación resolvedor ×
+# heurística sobre ellas. Cada combinación corre en un proceso nuevo.
+#
+# La memoria se mide en una segunda pasada con tracemalloc (el pico de cada
+# búsqueda sobre lo ya reservado, sin las tablas de la heurística), porque la
+# traza frena la búsqueda y no debe entrar en los tiempos. La RSS pico del
+# proceso no sirve para esto: la dominan los imports (numpy) y sale igual
+# para todas las combinaciones. De los procesos trabajadores de HDA* solo se
+# puede dar la RSS pico del mayor de ellos.
+#
+#   python benchmark.py --por-profundidad 5 --json resultados.json
+#   python benchmark.py --solvers astar --heuristicas manhattan,pdb --profundidades 20-31
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage no se mide la RSS de los trabajadores
+    resource = None
+
+# Resolvedores que no usan heurística (se ejecutan una sola vez)
+SIN_HEURISTICA = {"oraculo", "bidireccional"}
+# Resolvedores que no aceptan límite de expansiones
+SIN_LIMITE = {"oraculo"}
+# Resolvedores que pueden devolver rutas más largas que la óptima
+SUBOPTIMOS = {"anytime"}
+
+
+def generar_instancias(profundidades: List[int], por_profundidad: int,
+                       semilla: int) -> List[Tuple[int, List[int]]]:
+    """[(profundidad, estado)]: hasta `por_profundidad` estados al azar de cada una."""
+    rng = random.Random(semilla)
+    grupos = Oraculo().por_profundidad()
+    instancias = []
+    for d in profundidades:
+        rangos = grupos[d] if d < len(grupos) else []
+        for r in rng.sample(rangos, min(por_profundidad, len(rangos))):
+            instancias.append((d, list(Tablero.from_codigo(desrango(r)).state)))
+    return instancias
+
+
+def _rss_hijos_kb() -> Optional[int]:
+    """RSS pico del mayor proceso hijo ya terminado (0 si no hubo ninguno)."""
+    if resource is None:
+        return None
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def medir_combinacion(solver: str, heuristica: Optional[str],
+                      instancias: List[Tuple[int, List[int]]],
+                      max_expansions: int, medir_memoria: bool = True) -> dict:
+    """Se ejecuta en un proceso aparte: resuelve todas las instancias con una combinación."""
+    fn, _ = SOLVERS[solver]
+    kwargs: dict = {}
+    if heuristica is not None:
+        kwargs["heuristic"] = HEURISTICAS[heuristica]()  # carga de tablas fuera del cronómetro
+    if solver not in SIN_LIMITE:
+        kwargs["max_expansions"] = max_expansions
+
+    por_prof: Dict[int, dict] = {}
+    for d, estado in instancias:
+        fila = por_prof.setdefault(d, {"profundidad": d, "instancias": 0, "fallos": 0,
+                                       "expansiones": 0, "tiempo": 0.0,
+                                       "tiempo_resueltas": 0.0, "memoria_pico": None})
+        fila["instancias"] += 1
+        inicio = time.perf_counter()
+        try:
+            ruta, expansions = fn(Tablero(tuple(estado)), **kwargs)
+        except ValueError:
+            fila["fallos"] += 1
+            continue
+        finally:
+            transcurrido = time.perf_counter() - inicio
+            fila["tiempo"] += transcurrido
+        if len(ruta) < d or (len(ruta) > d and solver not in SUBOPTIMOS):
+            raise AssertionError(f"{solver}/{heuristica}: ruta de {len(ruta)} en una instancia de {d}")
+        # Para nodos/s solo cuentan las resueltas, que son las que suman expansiones
+        fila["expansiones"] += expansions
+        fila["tiempo_resueltas"] += transcurrido
+
+    if medir_memoria:
+        tracemalloc.start()
+        for d, estado in instancias:
+            tracemalloc.reset_peak()
+            antes = tracemalloc.get_traced_memory()[0]
+            try:
+                fn(Tablero(tuple(estado)), **kwargs)
+            except ValueError:
+                pass
+            pico = tracemalloc.get_traced_memory()[1] - antes
+            fila = por_prof[d]
+            fila["memoria_pico"] = max(fila["memoria_pico"] or 0, pico)
+        tracemalloc.stop()
+
+    return {"solver": solver, "heuristica": heuristica, "rss_hijos_kb": _rss_hijos_kb(),
+            "profundidades": [por_prof[d] for d in sorted(por_prof)]}
+
+
+def _rango_profundidades(texto: str) -> List[int]:
+    profundidades: List[int] = []
+    for parte in texto.split(","):
+        a, _, b = parte.partition("-")
+        profundidades.extend(range(int(a), int(b or a) + 1))
+    return profundidades
+
+
+def _tabla(resultados: List[dict]) -> str:
+    cabecera = f"{'solver':<13} {'heurística':<10} {'prof':>4} {'n':>3} {'fallos':>6} " \
+               f"{'expansiones':>12} {'nodos/s':>10} {'tiempo (s)':>11} {'mem (MB)':>9} " \
+               f"{'trab. (MB)':>10}"
+    lineas = [cabecera, "-" * len(cabecera)]
+    for r in resultados:
+        # RSS del mayor trabajador: solo la hay en los resolvedores con procesos (hda)
+        hijos = r["rss_hijos_kb"]
+        trab = "n/d" if hijos is None else "-" if hijos == 0 else f"{hijos / 1024:.1f}"
+        for fila in r["profundidades"]:
+            ok = fila["instancias"] - fila["fallos"]
+            mem = "n/d" if fila["memoria_pico"] is None else f"{fila['memoria_pico'] / 1e6:.2f}"
+            lineas.append(
+                f"{r['solver']:<13} {r['heuristica'] or '-':<10} {fila['profundidad']:>4} "
+                f"{fila['instancias']:>3} {fila['fallos']:>6} "
+                f"{fila['expansiones'] / max(ok, 1):>12.1f} {fila['nodos_s']:>10.0f} "
+                f"{fila['tiempo'] / fila['instancias']:>11.4f} {mem:>9} {trab:>10}")
+    return "\n".join(lineas)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Banco de pruebas de los resolvedores del 8-puzzle.")
+    parser.add_argument("--profundidades", type=_rango_profundidades, default=list(range(32)),
+                        help="p. ej. '0-31' o '20,25-31' (por defecto 0-31)")
+    parser.add_argument("--por-profundidad", type=int, default=3,
+                        help="instancias por profundidad")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--solvers", default=",".join(SOLVERS),
+                        help=f"separados por comas (disponibles: {', '.join(SOLVERS)})")
+    parser.add_argument("--heuristicas", default=",".join(HEURISTICAS),
+                        help=f"separadas por comas (disponibles: {', '.join(HEURISTICAS)})")
+    parser.add_argument("--max-expansiones", type=int, default=200000)
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="no hacer la segunda pasada que mide la memoria pico")
+    parser.add_argument("--json", metavar="ARCHIVO",
+                        help="guarda los resultados en JSON ('-' para stdout, sin tabla)")
+    args = parser.parse_args(argv)
+
+    solvers = [s for s in args.solvers.split(",") if s]
+    heuristicas = [h for h in args.heuristicas.split(",") if h]
+    for nombre, disponibles in ((solvers, SOLVERS), (heuristicas, HEURISTICAS)):
+        desconocidos = set(nombre) - set(disponibles)
+        if desconocidos:
+            parser.error(f"desconocidos: {', '.join(sorted(desconocidos))}")
+
+    instancias = generar_instancias(args.profundidades, args.por_profundidad, args.semilla)
+    combinaciones = [(s, None) if s in SIN_HEURISTICA else (s, h)
+                     for s in solvers for h in heuristicas]
+    combinaciones = list(dict.fromkeys(combinaciones))
+
+    resultados = []
+    contexto = multiprocessing.get_context("spawn")
+    for solver, heuristica in combinaciones:
+        print(f"→ {solver} / {heuristica or '-'} ({len(instancias)} instancias)", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+            r = pool.submit(medir_combinacion, solver, heuristica, instancias,
+                            args.max_expansiones, not args.sin_memoria).result()
+        for fila in r["profundidades"]:
+            t = fila["tiempo_resueltas"]
+            fila["nodos_s"] = fila["expansiones"] / t if t else 0.0
+        resultados.append(r)
+
+    informe = {"semilla": args.semilla, "por_profundidad": args.por_profundidad,
+               "max_expansiones": args.max_expansiones, "resultados": resultados}
+    if args.json == "-":
+        json.dump(informe, sys.stdout, indent=2)
+        print()
+        return 0
+    print(_tabla(resultados))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from model.board import Tablero
+
+
+class CacheRutas:
+    """Caché LRU acotada: estado -> resto óptimo de la ruta hasta la meta.
+
+    La meta es siempre la misma, así que si una ruta óptima pasa por un
+    estado, el trozo que queda desde él también es óptimo. `guardar` apunta
+    ese resto para todos los estados de la ruta; al llenarse se olvidan los
+    que hace más tiempo que no se consultan. Los restos se guardan como
+    cadenas de movimientos ("LURD…"), que ocupan un byte por movimiento.
+    """
+
+    def __init__(self, capacidad: int = 50000):
+        self.capacidad = capacidad
+        self._rutas: "OrderedDict[Tuple[int, ...], str]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self) -> int:
+        return len(self._rutas)
+
+    def get(self, tablero: Tablero) -> Optional[List[str]]:
+        ruta = self._rutas.get(tablero.state)
+        if ruta is None:
+            self.fallos += 1
+            return None
+        self._rutas.move_to_end(tablero.state)
+        self.aciertos += 1
+        return list(ruta)
+
+    def guardar(self, tablero: Tablero, ruta: List[str]) -> None:
+        """Apunta el resto de `ruta` (óptima desde `tablero`) para cada estado que recorre."""
+        movimientos = "".join(ruta)
+        rutas = self._rutas
+        for i in range(len(movimientos) + 1):
+            rutas[tablero.state] = movimientos[i:]
+            rutas.move_to_end(tablero.state)
+            if i < len(movimientos):
+                tablero = tablero.movimiento(movimientos[i])
+        while len(rutas) > self.capacidad:
+            rutas.popitem(last=False)
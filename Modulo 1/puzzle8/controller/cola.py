@@ -0,0 +1,94 @@
+from __future__ import annotations
+from typing import Callable, List, Tuple
+
+
+class ColaCubetas:
+    """Lista abierta por cubetas para f enteras y pequeñas.
+
+    `cubetas[f][h]` es una pila LIFO de estados empaquetados: se saca siempre
+    la menor f y, a igual f, la menor h (el nodo más profundo). No hace falta
+    envolver cada nodo en un objeto: g = f - h. Meter y sacar cuestan O(1)
+    amortizado, porque los punteros a la menor f y h solo avanzan salvo que
+    se meta algo por debajo de ellos.
+    """
+
+    def __init__(self):
+        self._cubetas: List[List[List[int]]] = []
+        self._hmin: List[int] = []
+        self._fmin = 0
+        self._tam = 0
+
+    def __len__(self) -> int:
+        return self._tam
+
+    def push(self, f: int, h: int, estado: int) -> None:
+        cubetas = self._cubetas
+        while len(cubetas) <= f:
+            cubetas.append([])
+            self._hmin.append(0)
+        pilas = cubetas[f]
+        while len(pilas) <= h:
+            pilas.append([])
+        pilas[h].append(estado)
+        if h < self._hmin[f]:
+            self._hmin[f] = h
+        if f < self._fmin:
+            self._fmin = f
+        self._tam += 1
+
+    def pop(self) -> Tuple[int, int, int]:
+        """Devuelve (f, h, estado) con la menor f y, a igual f, la menor h."""
+        if not self._tam:
+            raise IndexError("pop de una cola vacía")
+        cubetas = self._cubetas
+        f = self._fmin
+        while True:
+            pilas = cubetas[f]
+            h = self._hmin[f]
+            while h < len(pilas) and not pilas[h]:
+                h += 1
+            if h < len(pilas):
+                break
+            # Cubeta f agotada: se reinicia su puntero y se pasa a la siguiente
+            self._hmin[f] = 0
+            f += 1
+        self._fmin = f
+        self._hmin[f] = h
+        self._tam -= 1
+        return f, h, pilas[h].pop()
+
+    def transformar(self, fn: Callable[[int], int]) -> None:
+        """Sustituye cada entrada e por fn(e), sin cambiar su (f, h) ni el orden."""
+        for pilas in self._cubetas:
+            for pila in pilas:
+                pila[:] = map(fn, pila)
+
+    def extender(self, f: int, h: int, estados: List[int]) -> None:
+        """`push` de varios estados con la misma (f, h) de una vez."""
+        if not estados:
+            return
+        self.push(f, h, estados[0])
+        self._cubetas[f][h].extend(estados[1:])
+        self._tam += len(estados) - 1
+
+    def pop_lote(self, limite: int) -> Tuple[int, List[int], List[int]]:
+        """Saca hasta `limite` entradas de la menor f, por h creciente.
+
+        Devuelve (f, hs, estados). Siempre saca al menos una entrada.
+        """
+        f, h, estado = self.pop()
+        hs, estados = [h], [estado]
+        pilas = self._cubetas[f]
+        while len(estados) < limite and h < len(pilas):
+            pila = pilas[h]
+            k = min(len(pila), limite - len(estados))
+            if k:
+                estados.extend(pila[-k:])
+                del pila[-k:]
+                hs.extend([h] * k)
+                self._tam -= k
+            if pila:
+                break
+            h += 1
+        self._hmin[f] = h
+        return f, hs, estados
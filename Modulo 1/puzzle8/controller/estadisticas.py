@@ -0,0 +1,77 @@
+from __future__ import annotations
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+
+@dataclass
+class EstadisticasBusqueda:
+    """Contadores y tiempos de una búsqueda (se pasa como `stats=` al resolvedor).
+
+    Los contadores se llevan en variables locales (se incrementan haya o no
+    `stats`) y se copian aquí al terminar; los que un resolvedor no lleva
+    (HDA*, el oráculo...) se quedan en None y `resumen` no los muestra. Medir el tiempo de la heurística
+    añade una llamada y dos lecturas del reloj por nodo, lo que infla el propio
+    porcentaje medido, y la memoria pico también tiene coste; por eso las dos
+    mediciones están apagadas por defecto y se activan por separado.
+    """
+    medir_heuristica: bool = False
+    medir_memoria: bool = False
+
+    expansiones: int = 0
+    generados: Optional[int] = None     # sucesores construidos
+    empujes: Optional[int] = None       # entradas metidas en la lista abierta
+    reempujes: Optional[int] = None     # estados ya vistos que se volvieron a meter con mejor g
+    obsoletos: Optional[int] = None     # entradas sacadas y descartadas por tener peor g
+    max_abiertos: Optional[int] = None  # tamaño máximo de la lista abierta (o de la ruta, en IDA*)
+    tiempo_total: float = 0.0
+    tiempo_heuristica: float = 0.0
+    memoria_pico: int = 0   # bytes, solo con medir_memoria
+    por_trabajador: List[int] = field(default_factory=list)  # expansiones, en HDA*
+
+    def cronometrar(self, fn: Callable[..., int]) -> Callable[..., int]:
+        """Envuelve una función de la heurística para acumular su tiempo."""
+        if not self.medir_heuristica:
+            return fn
+        reloj = time.perf_counter
+
+        def medida(*args: int) -> int:
+            t = reloj()
+            r = fn(*args)
+            self.tiempo_heuristica += reloj() - t
+            return r
+        return medida
+
+    def empezar(self) -> float:
+        if self.medir_memoria:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                self._parar_traza = False
+            else:
+                tracemalloc.start()
+                self._parar_traza = True
+        return time.perf_counter()
+
+    def terminar(self, inicio: float) -> None:
+        self.tiempo_total = time.perf_counter() - inicio
+        if self.medir_memoria:
+            self.memoria_pico = tracemalloc.get_traced_memory()[1]
+            if self._parar_traza:
+                tracemalloc.stop()
+
+    def resumen(self) -> str:
+        """Una línea para la barra de estado."""
+        contadores = (("generados", self.generados), ("re-encolados", self.reempujes),
+                      ("obsoletos", self.obsoletos), ("abiertos máx.", self.max_abiertos))
+        partes = [f"{nombre} {valor}" for nombre, valor in contadores if valor is not None]
+        if self.medir_heuristica and self.tiempo_total > 0:
+            pct = 100 * self.tiempo_heuristica / self.tiempo_total
+            partes.append(f"heurística {pct:.0f}% de {self.tiempo_total:.2f} s")
+        else:
+            partes.append(f"{self.tiempo_total:.2f} s")
+        if self.por_trabajador:
+            partes.append("por trabajador " + "/".join(map(str, self.por_trabajador)))
+        if self.medir_memoria:
+            partes.append(f"memoria pico {self.memoria_pico / 1e6:.1f} MB")
+        return "  ·  ".join(partes)
@@ -1,19 +1,41 @@
 from __future__ import annotations
 from typing import Optional, List
 from model.board import Tablero
-from .solver import astar
+from .cache import CacheRutas
+from .estadisticas import EstadisticasBusqueda
+from .solver import OPTIMOS, SOLVERS, BusquedaCancelada
+import queue
 import random
+import threading
+
+# Cada cuánto (ms) revisa el hilo de Tk los mensajes de la búsqueda en curso
+INTERVALO_REVISION_MS = 50
+# Duración mínima de un cuadro de la animación (~60 fps): con retardos más
+# cortos se aplican varios movimientos por cuadro y solo se dibuja el último
+MS_POR_CUADRO = 16
 
 class PuzzleController:
-    def __init__(actual, tablero: Tablero):
+    def __init__(actual, tablero: Tablero, modo: str = "astar",
+                 cache: Optional[CacheRutas] = None):
+        if modo not in SOLVERS:
+            raise ValueError(f"Modo de resolución desconocido: {modo}")
+        actual.modo = modo
         actual.tablero = tablero
         actual._init = tablero
         actual.movimientos_jugador = 0
+        # Búsqueda en segundo plano: evento para cancelarla y cola de mensajes
+        # del hilo trabajador al hilo de Tk (None si no hay ninguna en curso)
+        actual._cancelar: Optional[threading.Event] = None
+        actual._mensajes: Optional[queue.Queue] = None
+        # Restos óptimos de rutas ya resueltas: repetir o continuar una
+        # solución no vuelve a buscar
+        actual.cache = cache if cache is not None else CacheRutas()
 
     def hacer_gui(actual, guiview):
         actual.view = guiview
         guiview.bind_on_shuffle(actual.barajear)
         guiview.bind_on_solve(actual.on_solve)
+        guiview.bind_on_cancel(actual.on_cancel)
         actual.view.render(actual.tablero)
         if actual.tablero.es_meta():
             actual.view.set_status("¡Resuelto!")
@@ -30,51 +52,144 @@ class PuzzleController:
         actual.movimientos_jugador = 0
         actual.view.render(actual.tablero, header=f"Barajado ({n} movimientos)")
 
-    def on_solve(actual, animate: bool = True, delay_ms: int = 100):
+    def on_solve(actual, animate: bool = True, delay_ms: int = 100, modo: str | None = None):
+        if actual._mensajes is not None:
+            return  # ya hay una búsqueda en curso
+        modo = modo or actual.modo
         try:
-            actual.view.set_status("Buscando solución con A* …")
-           
-            #Llama al algoritmo A* pasando el tablero actual.
-            ruta, nodos_expandidos = astar(actual.tablero) 
-            total = len(ruta) #Calcula el total de movimientos necesarios para resolver
-            
-            #Guarda estadísticas para usarlas al final de la animación
-            actual.movimientos_solver = 0
-            actual.solver_total = total
-            actual.solver_nodos_expandidos = nodos_expandidos
-
-                       
-            actual._playback(
-            ruta[:],
-            delay_ms 
+            solver, etiqueta = SOLVERS[modo]
+        except KeyError:
+            actual.view.set_status(f"Modo de resolución desconocido: {modo}")
+            return
+
+        # Estado ya visto en una solución óptima anterior: sin búsqueda
+        ruta = actual.cache.get(actual.tablero)
+        if ruta is not None:
+            actual.solver_etiqueta = f"{etiqueta} (caché)"
+            actual.solver_stats = None
+            actual._reproducir(ruta, None, delay_ms)
+            return
+
+        actual.solver_etiqueta = etiqueta
+        actual.view.set_status(f"Buscando solución con {etiqueta} …")
+        actual.view.set_searching(True)
+
+        # La búsqueda corre en un hilo aparte para no congelar la ventana; el
+        # hilo solo escribe en la cola y Tk la lee con `schedule`.
+        cancelar = threading.Event()
+        mensajes: queue.Queue = queue.Queue()
+        tablero = actual.tablero
+        stats = EstadisticasBusqueda()
+
+        def progreso(expansiones: int, abiertos: int, f: int):
+            if cancelar.is_set():
+                raise BusquedaCancelada("Búsqueda cancelada.")
+            mensajes.put(("progreso", (expansiones, abiertos, f)))
+
+        def trabajo():
+            try:
+                #Llama al resolvedor elegido (A* por defecto) pasando el tablero actual.
+                mensajes.put(("ruta", solver(tablero, progreso=progreso, stats=stats)))
+            except ValueError as e:
+                mensajes.put(("error", str(e)))
+            except Exception as e:
+                # Cualquier otro fallo (pickle en HDA*, RecursionError, OSError al
+                # cargar tablas...) también tiene que llegar a la cola: si no, la
+                # revisión nunca termina y los botones se quedan desactivados
+                mensajes.put(("error", f"Error en la búsqueda ({type(e).__name__}): {e}"))
+
+        actual._cancelar = cancelar
+        actual._mensajes = mensajes
+        actual.solver_stats = stats
+        # Solo las rutas óptimas valen para la caché
+        actual._origen = tablero if modo in OPTIMOS else None
+        threading.Thread(target=trabajo, daemon=True).start()
+        actual.view.schedule(INTERVALO_REVISION_MS, lambda: actual._revisar_busqueda(delay_ms))
+
+    def on_cancel(actual):
+        if actual._cancelar is not None:
+            actual._cancelar.set()
+            actual.view.set_status("Cancelando búsqueda …")
+
+    def _revisar_busqueda(actual, delay_ms: int):
+        """Vacía la cola de la búsqueda en el hilo de Tk."""
+        mensajes = actual._mensajes
+        if mensajes is None:
+            return
+        ultimo = None
+        while True:
+            try:
+                tipo, dato = mensajes.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == "progreso":
+                ultimo = dato
+                continue
+
+            # Terminó la búsqueda: con ruta o con error
+            actual._mensajes = actual._cancelar = None
+            actual.view.set_searching(False)
+            if tipo == "error":
+                actual.view.set_status(dato)
+                return
+            ruta, nodos_expandidos = dato
+            if actual._origen is not None:
+                actual.cache.guardar(actual._origen, ruta)
+            actual._reproducir(ruta, nodos_expandidos, delay_ms)
+            return
+
+        if ultimo is not None and not actual._cancelar.is_set():
+            expansiones, abiertos, f = ultimo
+            actual.view.set_status(
+                f"Buscando con {actual.solver_etiqueta} …  expandidos: {expansiones}"
+                f"  ·  abiertos: {abiertos}  ·  f: {f}"
             )
-    
-        except ValueError as e:
-            actual.view.set_status(str(e))
+        actual.view.schedule(INTERVALO_REVISION_MS, lambda: actual._revisar_busqueda(delay_ms))
+
+
+    def _reproducir(actual, ruta: List[str], nodos_expandidos: Optional[int], delay_ms: int):
+        total = len(ruta) #Calcula el total de movimientos necesarios para resolver
 
+        #Guarda estadísticas para usarlas al final de la animación
+        actual.movimientos_solver = 0
+        actual.solver_total = total
+        actual.solver_nodos_expandidos = nodos_expandidos
+
+        actual._playback(
+        ruta,
+        delay_ms 
+        )
 
-    def _playback(actual, raiz: List[str], delay_ms: int):
+    def _playback(actual, raiz: List[str], delay_ms: int, i: int = 0):
         # Si ya no hay movimientos, deja el mensaje final con ambas métricas
-        if not raiz:
+        if i >= len(raiz):
             total = getattr(actual, "solver_total", actual.movimientos_solver)
             exp = getattr(actual, "solver_nodos_expandidos", None)
+            etiqueta = getattr(actual, "solver_etiqueta", "A*")
+            stats = getattr(actual, "solver_stats", None)
 
             # Ajusta el contador por si faltó sincronizar
             actual.movimientos_solver = total
 
             if exp is not None:
                 actual.view.set_status(
-                    f"¡Resuelto por A* en {total} movimientos! "
+                    f"¡Resuelto por {etiqueta} en {total} movimientos! "
                     f"Nodos expandidos: {exp}"
+                    + (f"  ·  {stats.resumen()}" if stats is not None else "")
                 )
             else:
-                actual.view.set_status(f"¡Resuelto por A* en {total} movimientos!")
+                actual.view.set_status(f"¡Resuelto por {etiqueta} en {total} movimientos!")
             return
 
-        # Aplica el siguiente movimiento
-        mv = raiz.pop(0)
-        actual.tablero = actual.tablero.movimiento(mv)
-        actual.movimientos_solver += 1
+        # Aplica el siguiente movimiento (o los de este cuadro); `raiz` no se
+        # modifica, se avanza con el índice `i`
+        espera, por_cuadro = delay_ms, 1
+        if delay_ms < MS_POR_CUADRO:
+            espera, por_cuadro = MS_POR_CUADRO, MS_POR_CUADRO // max(delay_ms, 1)
+        for mv in raiz[i:i + por_cuadro]:
+            actual.tablero = actual.tablero.movimiento(mv)
+            actual.movimientos_solver += 1
+        i = min(i + por_cuadro, len(raiz))
 
         # Progreso en vivo: paso X/Y
         paso = actual.movimientos_solver
@@ -82,9 +197,9 @@ class PuzzleController:
 
         actual.view.render(
             actual.tablero,
-            header=f"A* aplicando: {mv}  ·  Paso {paso}/{total}",
+            header=f"{getattr(actual, 'solver_etiqueta', 'A*')} aplicando: {mv}  ·  Paso {paso}/{total}",
             movs=paso
         )
 
         # Programa el siguiente paso (usa el scheduler propio de tu vista)
-        actual.view.schedule(delay_ms, lambda: actual._playback(raiz, delay_ms))
\ No newline at end of file
+        actual.view.schedule(espera, lambda: actual._playback(raiz, delay_ms, i))
\ No newline at end of file
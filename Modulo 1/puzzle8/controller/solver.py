@@ -1,69 +1,976 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional, Tuple
 import heapq
-from model.board import Tablero
-from model.heuristics import manhattan
+import multiprocessing
+import os
+import queue
+import time
+from array import array
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from model.board import (MOVIMIENTOS, ORDENES_FICHAS, TOTAL_ESTADOS, Geometria, Tablero,
+                         geometria, rango, rango_vertical)
+from model.heuristics import (Manhattan, como_heuristica, conflicto_lineal, distancia_caminata,
+                              manhattan)
+from model.oraculo import Oraculo
+from model.pdb import PatronesAditivos
+from .cola import ColaCubetas
+from .estadisticas import EstadisticasBusqueda
 
 Heuristic = Callable[[Tablero], int]
 
-@dataclass(order=True)
-class Prioritized:
-    f: int
-    act: int
-    board: Tablero = field(compare=False)
-def trazar_ruta(raiz: Dict[Tablero, Tuple[Optional[Tablero], Optional[str]]],
-                solution: Tablero) -> List[str]:
+# Progreso: (expansiones, tamaño de la lista abierta, f en curso). Los
+# resolvedores lo llaman cada PASO_PROGRESO expansiones; para cancelar una
+# búsqueda basta con lanzar BusquedaCancelada desde él.
+Progreso = Callable[[int, int, int], None]
+PASO_PROGRESO = 1000
+
+
+class BusquedaCancelada(ValueError):
+    """La búsqueda se interrumpió desde el callback de progreso."""
+
+# --- LISTA CERRADA ---
+# g y movimiento padre de cada estado visto, en dicts indexados por el estado.
+# En el 8-puzzle, si la búsqueda crece más allá de UMBRAL_RANGO estados, se
+# pasa a dos arrays de un byte indexados por `rango` (9!/2 entradas, ~360 KB
+# en total): ocupan mucho menos, pero calcular el rango de cada hijo cuesta
+# más que buscar en un dict, y la mayoría de búsquedas no llegan al umbral.
+SIN_G = 127  # g de un estado no visto (máximo de array('b'))
+UMBRAL_RANGO = 20000
+RAIZ = -1    # movimiento "padre" del estado inicial
+NOMBRES_MOV = tuple(MOVIMIENTOS)
+INDICE_MOV = {m: i for i, m in enumerate(NOMBRES_MOV)}
+
+
+class _TablaDispersa(dict):
+    """dict que devuelve `defecto` para las claves que no tiene."""
+
+    def __init__(self, defecto: int):
+        super().__init__()
+        self.defecto = defecto
+
+    def __missing__(self, clave: int) -> int:
+        return self.defecto
+
+
+def _cerrada_por_rango(costo: Dict[int, int], raiz: Dict[int, int]) -> Tuple[array, array]:
+    """Pasa la lista cerrada del 8-puzzle de dicts por estado a arrays por rango."""
+    costo_r = array('b', [SIN_G]) * TOTAL_ESTADOS
+    raiz_r = array('b', [RAIZ]) * TOTAL_ESTADOS
+    for estado, g in costo.items():
+        r = rango(estado)
+        costo_r[r] = g
+        raiz_r[r] = raiz[estado]
+    return costo_r, raiz_r
+
+
+def trazar_ruta(mov_de, solution: int, geo: Geometria, por_rango: bool) -> List[str]:
+    """Reconstruye la ruta desde `solution` deshaciendo los movimientos guardados."""
     movimientos: List[str] = []
-    actual = solution 
+    actual = solution
+    n = geo.n
     while True:
-        prev, mov = raiz[actual]
-        if prev is None:
+        i = mov_de[rango(actual) if por_rango else actual]
+        if i == RAIZ:
             break
-        movimientos.append(mov)  
-        actual = prev
+        mov = NOMBRES_MOV[i]
+        df, dc = MOVIMIENTOS[mov]
+        # El hueco llegó aquí con `mov`: en el padre estaba en la casilla opuesta
+        actual = geo.mover(actual, geo.hueco(actual) - df * n - dc)
+        movimientos.append(mov)
     movimientos.reverse()
     return movimientos
 
 def astar(start: Tablero,
           heuristic: Heuristic = manhattan,
-          max_expansions: int = 200000) -> Tuple[List[str], int]:
-          
+          max_expansions: int = 200000,
+          progreso: Optional[Progreso] = None,
+          stats: Optional[EstadisticasBusqueda] = None) -> Tuple[List[str], int]:
+
     if not start.es_resoluble():
         raise ValueError("El estado inicial NO es resoluble (paridad incorrecta).")
+    if stats is not None:
+        reloj = stats.empezar()
 
-    costo_acumulado: Dict[Tablero, int] = {start: 0}
-    raiz: Dict[Tablero, Tuple[Optional[Tablero], Optional[str]]] = {start: (None, None)}
+    # Toda la búsqueda trabaja con estados empaquetados en un int
+    # (ver model.board.Geometria); solo la entrada es un Tablero.
+    geo = start.geometria
+    bits, mascara, despl_h = geo.bits, geo.mascara, geo.despl_hueco
+    vecinos, meta = geo.vecinos, geo.codigo_meta
+    heur = como_heuristica(heuristic).para(geo.n)
+    h_hijo = heur.hijo
+    if stats is not None:
+        h_hijo = stats.cronometrar(h_hijo)
+    inicio = start.codigo()
 
-    act = 0
-    open_heap: List[Prioritized] = []
-    heapq.heappush(open_heap, Prioritized(heuristic(start), act, start))
-    visited: set[Tablero] = set()
+    # Cerrada: la clave de un estado es el propio código hasta que (solo en
+    # 3x3) se pasa a indexar por rango; ver LISTA CERRADA
+    por_rango = False
+    pasar_a_rango = geo.n == 3
+    no_visto = 1_000_000_000
+    costo_acumulado = _TablaDispersa(no_visto)
+    raiz = {inicio: RAIZ}
+    costo_acumulado[inicio] = 0
+
+    # Lista abierta por cubetas (f, h): cada entrada es solo el estado, g = f - h.
+    # Con rango, la entrada lleva además el rango en los bits altos, para no
+    # recalcularlo al sacarla.
+    despl_clave = despl_h + bits
+    mascara_estado = (1 << despl_clave) - 1
+    abierta = ColaCubetas()
+    h0 = heur.codigo(inicio)
+    abierta.push(h0, h0, inicio)
 
     expansions = 0
+    # Contadores para `stats`: locales (un incremento barato por nodo) y solo
+    # se copian a `stats` al terminar
+    generados = empujes = reempujes = obsoletos = max_abiertos = 0
 
-    while open_heap:
-        actual = heapq.heappop(open_heap).board
-        if actual in visited:
-            continue
-        visited.add(actual)
+    try:
+        while abierta:
+            if pasar_a_rango and len(costo_acumulado) > UMBRAL_RANGO:
+                costo_acumulado, raiz = _cerrada_por_rango(costo_acumulado, raiz)
+                abierta.transformar(lambda e: (rango(e) << despl_clave) | e)
+                por_rango, pasar_a_rango, no_visto = True, False, SIN_G
+
+            f_actual, h_actual, entrada = abierta.pop()
+            g_actual = f_actual - h_actual
+            if por_rango:
+                clave, actual = entrada >> despl_clave, entrada & mascara_estado
+            else:
+                clave = actual = entrada
+            # Entrada obsoleta: el estado ya se alcanzó (y expandió) con menor g
+            if g_actual > costo_acumulado[clave]:
+                obsoletos += 1
+                continue
 
-        if actual.es_meta():
-            return trazar_ruta(raiz, actual), expansions
+            if actual == meta:
+                return trazar_ruta(raiz, actual, geo, por_rango), expansions
+
+            expansions += 1
+            if expansions > max_expansions:
+                raise ValueError("Se excedió el límite de expansiones.")
+            if progreso is not None and expansions % PASO_PROGRESO == 0:
+                progreso(expansions, len(abierta), f_actual)
+            if stats is not None and len(abierta) > max_abiertos:
+                max_abiertos = len(abierta)
+
+            tentative_g = g_actual + 1
+            hueco = actual >> despl_h
+            despl_hueco = hueco * bits
+            for move, destino, despl in vecinos[hueco]:
+                # Mover el hueco a `destino`: la ficha v pasa a la casilla del hueco
+                v = (actual >> despl) & mascara
+                nb = actual ^ (v << despl) ^ (v << despl_hueco) ^ ((hueco ^ destino) << despl_h)
+                generados += 1
+                if not por_rango:
+                    clave_nb = nb
+                elif destino - hueco in (1, -1):
+                    # Movimiento horizontal: el orden de las fichas no cambia,
+                    # solo la posición del hueco (ver board.rango)
+                    clave_nb = clave + (destino - hueco) * ORDENES_FICHAS
+                else:
+                    # Vertical: solo cambian los dígitos de Lehmer de 3 fichas
+                    clave_nb = rango_vertical(clave, actual, hueco, destino)
+                g_previo = costo_acumulado[clave_nb]
+                if tentative_g < g_previo:
+                    if g_previo != no_visto:
+                        reempujes += 1
+                    costo_acumulado[clave_nb] = tentative_g
+                    raiz[clave_nb] = INDICE_MOV[move]
+                    # Solo se movió la ficha v (de `destino` al hueco): h incremental
+                    h = h_hijo(h_actual, actual, nb, v, destino, hueco)
+                    abierta.push(tentative_g + h, h, (clave_nb << despl_clave) | nb if por_rango else nb)
+                    empujes += 1
+    finally:
+        if stats is not None:
+            stats.expansiones = expansions
+            stats.generados, stats.empujes = generados, empujes
+            stats.reempujes, stats.obsoletos = reempujes, obsoletos
+            stats.max_abiertos = max_abiertos
+            stats.terminar(reloj)
+
+    raise ValueError("No se encontró solución (¿estado incorrecto?).")
+
+
+def idastar(start: Tablero,
+            heuristic: Heuristic = manhattan,
+            max_expansions: int = 200000,
+            progreso: Optional[Progreso] = None,
+            stats: Optional[EstadisticasBusqueda] = None) -> Tuple[List[str], int]:
+    """IDA*: búsqueda en profundidad con cota f creciente.
+
+    Mismo contrato que `astar`, pero la memoria es O(profundidad): no hay
+    lista abierta ni cerrada, solo la ruta actual y un tablero mutable que se
+    modifica y se deshace en cada paso. Nunca se deshace el movimiento
+    anterior (se poda el hijo que devolvería el hueco a donde estaba).
+    """
+    if not start.es_resoluble():
+        raise ValueError("El estado inicial NO es resoluble (paridad incorrecta).")
+    if stats is not None:
+        reloj = stats.empezar()
+
+    geo = start.geometria
+    bits, despl_h = geo.bits, geo.despl_hueco
+    vecinos, meta = geo.vecinos, geo.codigo_meta
+    heur = como_heuristica(heuristic).para(geo.n)
+    h_hijo = heur.hijo
+    if stats is not None:
+        h_hijo = stats.cronometrar(h_hijo)
+    celdas = list(start.state)  # tablero mutable: se mueve y se deshace en sitio
+    ruta: List[str] = []
+    expansions = 0
+    generados = max_ruta = 0
+    ENCONTRADO = -1
+
+    def buscar(actual: int, hueco: int, anterior: int, g: int, h: int, limite: int) -> int:
+        """Devuelve ENCONTRADO o la menor f que superó `limite`."""
+        nonlocal expansions, generados, max_ruta
+        f = g + h
+        if f > limite:
+            return f
+        if actual == meta:
+            return ENCONTRADO
 
         expansions += 1
         if expansions > max_expansions:
             raise ValueError("Se excedió el límite de expansiones.")
+        if progreso is not None and expansions % PASO_PROGRESO == 0:
+            # Aquí la "lista abierta" es la ruta en curso
+            progreso(expansions, len(ruta), limite)
+        if stats is not None and g > max_ruta:
+            max_ruta = g
 
-        for move, nb in actual.neighbors():
-            if nb is None:
+        minimo = 1_000_000_000
+        despl_hueco = hueco * bits
+        for move, destino, despl in vecinos[hueco]:
+            if destino == anterior:
                 continue
-            tentative_g = costo_acumulado[actual] + 1
-            if tentative_g < costo_acumulado.get(nb, 1_000_000_000):
-                costo_acumulado[nb] = tentative_g
-                raiz[nb] = (actual, move)
-                act += 1
-                f = tentative_g + heuristic(nb)
-                heapq.heappush(open_heap, Prioritized(f, act, nb))
+            v = celdas[destino]
+            celdas[hueco], celdas[destino] = v, 0
+            nb = actual ^ (v << despl) ^ (v << despl_hueco) ^ ((hueco ^ destino) << despl_h)
+            ruta.append(move)
+            generados += 1
+
+            t = buscar(nb, destino, hueco, g + 1,
+                       h_hijo(h, actual, nb, v, destino, hueco), limite)
+            if t == ENCONTRADO:
+                return t
+
+            # Deshacer el movimiento
+            ruta.pop()
+            celdas[destino], celdas[hueco] = v, 0
+            if t < minimo:
+                minimo = t
+        return minimo
+
+    inicio = start.codigo()
+    hueco = celdas.index(0)
+    h0 = heur.codigo(inicio)
+    limite = h0
+    try:
+        while True:
+            t = buscar(inicio, hueco, -1, 0, h0, limite)
+            if t == ENCONTRADO:
+                return ruta[:], expansions
+            limite = t
+    finally:
+        if stats is not None:
+            # Cada hijo generado se "mete" y se "saca" de la ruta; no hay reaperturas
+            stats.expansiones = expansions
+            stats.generados = stats.empujes = generados
+            stats.reempujes = stats.obsoletos = 0
+            stats.max_abiertos = max_ruta
+            stats.terminar(reloj)
+
+
+# Movimiento que deshace a cada uno, por índice en NOMBRES_MOV
+INVERSO_MOV = tuple(INDICE_MOV[{'U': 'D', 'D': 'U', 'L': 'R', 'R': 'L'}[m]] for m in NOMBRES_MOV)
+
+
+def bidireccional(start: Tablero,
+                  max_expansions: int = 200000,
+                  progreso: Optional[Progreso] = None,
+                  stats: Optional[EstadisticasBusqueda] = None) -> Tuple[List[str], int]:
+    """BFS bidireccional (encuentro en el medio) entre `start` y la meta.
+
+    Mismo contrato que `astar`, sin heurística: todos los movimientos cuestan
+    1, así que basta con crecer por capas completas una búsqueda desde cada
+    extremo, siempre la de frontera más pequeña. Cuando un estado generado ya
+    lo tiene el otro lado hay una ruta de g_ida + g_vuelta; al terminar la
+    capa en la que aparece el primer encuentro, el mejor de esa capa es
+    óptimo (cualquier ruta más corta se habría cruzado en una capa anterior).
+    Explora del orden de b^(d/2) estados por lado en vez de b^d.
+    """
+    if not start.es_resoluble():
+        raise ValueError("El estado inicial NO es resoluble (paridad incorrecta).")
+    if stats is not None:
+        reloj = stats.empezar()
+
+    geo = start.geometria
+    bits, mascara, despl_h = geo.bits, geo.mascara, geo.despl_hueco
+    vecinos, meta = geo.vecinos, geo.codigo_meta
+    inicio = start.codigo()
+    if inicio == meta:
+        if stats is not None:
+            stats.terminar(reloj)
+        return [], 0
+
+    # Por lado: movimiento con el que se llegó a cada estado, su distancia
+    # al extremo de ese lado y la capa por expandir
+    mov_ida, mov_vuelta = {inicio: RAIZ}, {meta: RAIZ}
+    g_ida, g_vuelta = {inicio: 0}, {meta: 0}
+    frontera_ida, frontera_vuelta = [inicio], [meta]
+    radio_ida = radio_vuelta = 0
+
+    expansions = 0
+    generados = empujes = max_abiertos = 0
+    mejor, encuentro = 1_000_000_000, -1
+
+    try:
+        while frontera_ida and frontera_vuelta:
+            ida = len(frontera_ida) <= len(frontera_vuelta)
+            if ida:
+                frontera, mov_de, g_de, g_otro = frontera_ida, mov_ida, g_ida, g_vuelta
+                radio_ida += 1
+                g_nuevo = radio_ida
+            else:
+                frontera, mov_de, g_de, g_otro = frontera_vuelta, mov_vuelta, g_vuelta, g_ida
+                radio_vuelta += 1
+                g_nuevo = radio_vuelta
+
+            siguiente = []
+            for actual in frontera:
+                expansions += 1
+                if expansions > max_expansions:
+                    raise ValueError("Se excedió el límite de expansiones.")
+                if progreso is not None and expansions % PASO_PROGRESO == 0:
+                    progreso(expansions, len(frontera_ida) + len(frontera_vuelta),
+                             radio_ida + radio_vuelta)
+
+                hueco = actual >> despl_h
+                despl_hueco = hueco * bits
+                for move, destino, despl in vecinos[hueco]:
+                    v = (actual >> despl) & mascara
+                    nb = actual ^ (v << despl) ^ (v << despl_hueco) ^ ((hueco ^ destino) << despl_h)
+                    generados += 1
+                    if nb in mov_de:
+                        continue
+                    mov_de[nb] = INDICE_MOV[move]
+                    g_de[nb] = g_nuevo
+                    siguiente.append(nb)
+                    empujes += 1
+                    g = g_otro.get(nb)
+                    if g is not None and g_nuevo + g < mejor:
+                        mejor, encuentro = g_nuevo + g, nb
+
+            if ida:
+                frontera_ida = siguiente
+            else:
+                frontera_vuelta = siguiente
+            if stats is not None and len(frontera_ida) + len(frontera_vuelta) > max_abiertos:
+                max_abiertos = len(frontera_ida) + len(frontera_vuelta)
+            if encuentro >= 0:
+                return _unir_rutas(mov_ida, mov_vuelta, encuentro, geo), expansions
+    finally:
+        if stats is not None:
+            stats.expansiones = expansions
+            stats.generados, stats.empujes = generados, empujes
+            stats.max_abiertos = max_abiertos
+            stats.terminar(reloj)
 
     raise ValueError("No se encontró solución (¿estado incorrecto?).")
+
+
+def _unir_rutas(mov_ida: Dict[int, int], mov_vuelta: Dict[int, int],
+                encuentro: int, geo: Geometria) -> List[str]:
+    """Ruta inicio → `encuentro` seguida de `encuentro` → meta."""
+    movimientos = trazar_ruta(mov_ida, encuentro, geo, por_rango=False)
+    # La búsqueda de vuelta llegó a cada estado desde la meta con mov_vuelta;
+    # hacia la meta hay que aplicar el movimiento inverso.
+    actual = encuentro
+    while mov_vuelta[actual] != RAIZ:
+        mov = NOMBRES_MOV[INVERSO_MOV[mov_vuelta[actual]]]
+        df, dc = MOVIMIENTOS[mov]
+        actual = geo.mover(actual, geo.hueco(actual) + df * geo.n + dc)
+        movimientos.append(mov)
+    return movimientos
+
+
+def arastar(start: Tablero,
+            heuristic: Heuristic = manhattan,
+            max_expansions: int = 200000,
+            tiempo_max: Optional[float] = None,
+            peso: float = 2.5,
+            paso: float = 0.5,
+            progreso: Optional[Progreso] = None,
+            stats: Optional[EstadisticasBusqueda] = None) -> Iterator[Tuple[List[str], int, float]]:
+    """ARA*: A* ponderado "anytime" que va entregando rutas cada vez mejores.
+
+    Empieza con f = g + peso·h, que encuentra pronto una ruta como mucho
+    `peso` veces más larga que la óptima, y después baja el peso de `paso` en
+    `paso` hasta 1 reutilizando la búsqueda anterior: solo se vuelven a
+    expandir los estados cuya g mejoró (los de la lista de inconsistentes).
+    Cada mejora se entrega como (ruta, expansiones, cota), donde `cota` es el
+    factor de subóptimo garantizado (1.0 = óptima). Termina al demostrar la
+    óptima o al agotar `max_expansions` o `tiempo_max` segundos; si se agota
+    antes de la primera ruta, lanza ValueError como `astar`.
+    """
+    if not start.es_resoluble():
+        raise ValueError("El estado inicial NO es resoluble (paridad incorrecta).")
+    if stats is not None:
+        reloj = stats.empezar()
+    limite_tiempo = None if tiempo_max is None else time.perf_counter() + tiempo_max
+
+    geo = start.geometria
+    bits, mascara, despl_h = geo.bits, geo.mascara, geo.despl_hueco
+    vecinos, meta = geo.vecinos, geo.codigo_meta
+    heur = como_heuristica(heuristic).para(geo.n)
+    h_hijo = heur.hijo
+    if stats is not None:
+        h_hijo = stats.cronometrar(h_hijo)
+    inicio = start.codigo()
+
+    # Con pesos fraccionarios f no es entera, así que la abierta es un heap de
+    # (f, h, g, estado); una entrada es obsoleta si g ya no es la del estado.
+    no_visto = 1_000_000_000
+    costo_acumulado = _TablaDispersa(no_visto)
+    raiz = {inicio: RAIZ}
+    h_de = {inicio: heur.codigo(inicio)}
+    costo_acumulado[inicio] = 0
+    abierta = [(peso * h_de[inicio], h_de[inicio], 0, inicio)]
+    cerrada: set = set()
+    inconsistentes: set = set()
+
+    expansions = 0
+    generados = empujes = reempujes = obsoletos = max_abiertos = 0
+    g_meta = g_entregado = 0 if inicio == meta else no_visto
+    try:
+        while True:
+            # --- Mejorar la ruta con el peso actual ---
+            while abierta:
+                f_actual, h_actual, g_actual, actual = abierta[0]
+                if g_actual > costo_acumulado[actual] or actual in cerrada:
+                    heapq.heappop(abierta)
+                    obsoletos += 1
+                    continue
+                if g_meta <= f_actual:
+                    break
+                heapq.heappop(abierta)
+                cerrada.add(actual)
+
+                expansions += 1
+                if expansions > max_expansions or (
+                        limite_tiempo is not None and time.perf_counter() > limite_tiempo):
+                    if g_meta == no_visto:
+                        raise ValueError("Se excedió el límite de expansiones.")
+                    return
+                if progreso is not None and expansions % PASO_PROGRESO == 0:
+                    progreso(expansions, len(abierta), int(f_actual))
+                if stats is not None and len(abierta) > max_abiertos:
+                    max_abiertos = len(abierta)
+
+                tentative_g = g_actual + 1
+                hueco = actual >> despl_h
+                despl_hueco = hueco * bits
+                for move, destino, despl in vecinos[hueco]:
+                    v = (actual >> despl) & mascara
+                    nb = actual ^ (v << despl) ^ (v << despl_hueco) ^ ((hueco ^ destino) << despl_h)
+                    generados += 1
+                    g_previo = costo_acumulado[nb]
+                    if tentative_g < g_previo:
+                        costo_acumulado[nb] = tentative_g
+                        raiz[nb] = INDICE_MOV[move]
+                        if nb == meta:
+                            g_meta = tentative_g
+                        if nb in cerrada:
+                            # Ya expandido con este peso: se reabre en la siguiente vuelta
+                            inconsistentes.add(nb)
+                            reempujes += 1
+                            continue
+                        h = h_de.get(nb)
+                        if h is None:
+                            h = h_de[nb] = h_hijo(h_actual, actual, nb, v, destino, hueco)
+                        elif g_previo != no_visto:
+                            reempujes += 1
+                        heapq.heappush(abierta, (tentative_g + peso * h, h, tentative_g, nb))
+                        empujes += 1
+
+            if g_meta == no_visto:
+                raise ValueError("No se encontró solución (¿estado incorrecto?).")
+
+            # --- Entregar la ruta con su cota de subóptimo ---
+            # Toda ruta mejor pasa por un estado de la abierta o de los
+            # inconsistentes, así que su mínimo de g + h acota la óptima.
+            pendientes = {e[3] for e in abierta
+                          if e[2] == costo_acumulado[e[3]] and e[3] not in cerrada}
+            pendientes |= inconsistentes
+            minimo = min((costo_acumulado[s] + h_de[s] for s in pendientes), default=g_meta)
+            cota = max(1.0, min(peso, g_meta / minimo) if minimo else 1.0)
+            optima = peso <= 1.0 or cota <= 1.0
+            # Solo se entregan las mejoras, y al final la demostración de óptima
+            if g_meta < g_entregado or optima:
+                g_entregado = g_meta
+                yield trazar_ruta(raiz, meta, geo, False), expansions, cota
+            if optima:
+                return
+
+            # --- Bajar el peso y reordenar la abierta ---
+            peso = max(1.0, peso - paso)
+            abierta = [(costo_acumulado[s] + peso * h_de[s], h_de[s], costo_acumulado[s], s)
+                       for s in pendientes]
+            heapq.heapify(abierta)
+            cerrada.clear()
+            inconsistentes.clear()
+    finally:
+        if stats is not None:
+            stats.expansiones = expansions
+            stats.generados, stats.empujes = generados, empujes
+            stats.reempujes, stats.obsoletos = reempujes, obsoletos
+            stats.max_abiertos = max_abiertos
+            stats.terminar(reloj)
+
+
+def anytime(start: Tablero,
+            heuristic: Heuristic = manhattan,
+            max_expansions: int = 200000,
+            progreso: Optional[Progreso] = None,
+            stats: Optional[EstadisticasBusqueda] = None,
+            tiempo_max: Optional[float] = None) -> Tuple[List[str], int]:
+    """`arastar` con el contrato de `astar`: la mejor ruta dentro del presupuesto."""
+    mejor: Tuple[List[str], int] = ([], 0)
+    for ruta, expansions, _ in arastar(start, heuristic, max_expansions, tiempo_max,
+                                       progreso=progreso, stats=stats):
+        mejor = ruta, expansions
+    return mejor
+
+
+# --- A* POR LOTES (NumPy) ---
+# Tablas del 8-puzzle para `astar_lotes`: destino del hueco y validez de cada
+# movimiento (en el orden de NOMBRES_MOV) según la casilla del hueco, pesos
+# de Lehmer de las 6 primeras fichas y desplazamientos del empaquetado.
+# NumPy se importa aquí dentro y no arriba: solo lo usa `astar_lotes` y
+# cargarlo le costaría tiempo y memoria a todo el que importa este módulo
+# (la GUI, los trabajadores de HDA*, el servicio, el benchmark...).
+@lru_cache(maxsize=None)
+def _tablas_lotes():
+    import numpy as np
+    geo = geometria(3)
+    destino = np.zeros((9, len(NOMBRES_MOV)), dtype=np.intp)
+    valido = np.zeros((9, len(NOMBRES_MOV)), dtype=bool)
+    for hueco in range(9):
+        for move, d, _ in geo.vecinos[hueco]:
+            destino[hueco, INDICE_MOV[move]] = d
+            valido[hueco, INDICE_MOV[move]] = True
+    # Base mixta 8, 7, ..., 3 como en `rango`
+    pesos = np.array([7 * 6 * 5 * 4 * 3, 6 * 5 * 4 * 3, 5 * 4 * 3, 4 * 3, 3, 1], dtype=np.int64)
+    despl = np.arange(9, dtype=np.uint64) * np.uint64(geo.bits)
+    return destino, valido, pesos, despl, np.uint64(geo.despl_hueco)
+
+
+def _rango_lote(m, huecos):
+    """`rango` de cada fila de la matriz (N, 9) de estados."""
+    import numpy as np
+    _, _, pesos, _, _ = _tablas_lotes()
+    fichas = m[m != 0].reshape(len(m), 8)[:, :6].astype(np.int64)
+    # Dígito de Lehmer: valor - 1 - cuántas fichas anteriores son menores
+    menores = (fichas[:, None, :] < fichas[:, :, None]) & np.tri(6, k=-1, dtype=bool)
+    digitos = fichas - 1 - menores.sum(axis=2)
+    return huecos.astype(np.int64) * ORDENES_FICHAS + digitos @ pesos
+
+
+def astar_lotes(start: Tablero,
+                heuristic: Heuristic = manhattan,
+                max_expansions: int = 200000,
+                progreso: Optional[Progreso] = None,
+                stats: Optional[EstadisticasBusqueda] = None,
+                tam_lote: int = 256) -> Tuple[List[str], int]:
+    """A* que expande de golpe hasta `tam_lote` nodos de la misma f (8-puzzle).
+
+    Mismo contrato que `astar`. Los nodos del lote se desempaquetan en una
+    matriz (N, 9) de uint8 y los hijos, sus rangos y su h (Manhattan, con la
+    tabla DIST) se calculan con operaciones de NumPy; el filtrado contra la
+    cerrada y los duplicados del propio lote también es en bloque. Con otra
+    heurística la h de los supervivientes se calcula uno a uno con `hijo`.
+    Como solo se mezclan nodos de la misma f, la ruta sigue siendo óptima.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ValueError("El A* por lotes necesita NumPy (pip install numpy).") from None
+    if start.n != 3:
+        raise ValueError("El A* por lotes solo está implementado para el 8-puzzle (3x3).")
+    if not start.es_resoluble():
+        raise ValueError("El estado inicial NO es resoluble (paridad incorrecta).")
+    if stats is not None:
+        reloj = stats.empezar()
+
+    geo = start.geometria
+    destino, valido, _, despl, despl_hueco = _tablas_lotes()
+    heur = como_heuristica(heuristic).para(3)
+    dist = np.array(heur.dist, dtype=np.int64) if type(heur) is Manhattan else None
+    h_hijo = heur.hijo
+    if stats is not None:
+        h_hijo = stats.cronometrar(h_hijo)
+    meta, inicio = geo.codigo_meta, start.codigo()
+
+    costo_acumulado = np.full(TOTAL_ESTADOS, SIN_G, dtype=np.int8)
+    raiz = np.full(TOTAL_ESTADOS, RAIZ, dtype=np.int8)
+    costo_acumulado[rango(inicio)] = 0
+    abierta = ColaCubetas()
+    h0 = heur.codigo(inicio)
+    abierta.push(h0, h0, inicio)
+    filas = np.arange(tam_lote * len(NOMBRES_MOV))
+
+    expansions = 0
+    generados = empujes = obsoletos = max_abiertos = 0
+    try:
+        while abierta:
+            f_actual, hs, codigos = abierta.pop_lote(tam_lote)
+            if meta in codigos:
+                return trazar_ruta(raiz, meta, geo, True), expansions
+
+            cod = np.array(codigos, dtype=np.uint64)
+            m = ((cod[:, None] >> despl) & np.uint64(geo.mascara)).astype(np.uint8)
+            huecos = (cod >> despl_hueco).astype(np.intp)
+            h = np.array(hs, dtype=np.int64)
+            g = f_actual - h
+            # Entradas obsoletas: el estado ya se alcanzó con menor g
+            vigentes = g <= costo_acumulado[_rango_lote(m, huecos)]
+            obsoletos += len(cod) - int(vigentes.sum())
+            m, huecos, h, g, cod = m[vigentes], huecos[vigentes], h[vigentes], g[vigentes], cod[vigentes]
+            if not len(m):
+                continue
+
+            antes = expansions
+            expansions += len(m)
+            if expansions > max_expansions:
+                raise ValueError("Se excedió el límite de expansiones.")
+            if progreso is not None and expansions // PASO_PROGRESO > antes // PASO_PROGRESO:
+                progreso(expansions, len(abierta), f_actual)
+            if stats is not None and len(abierta) > max_abiertos:
+                max_abiertos = len(abierta)
+
+            # Todos los hijos a la vez: (padre, movimiento) para cada movimiento válido
+            padre, mov = np.nonzero(valido[huecos])
+            generados += len(padre)
+            desde = destino[huecos[padre], mov]
+            hasta = huecos[padre]
+            hijos = m[padre]
+            sel = filas[:len(padre)]
+            fichas = hijos[sel, desde]
+            hijos[sel, hasta] = fichas
+            hijos[sel, desde] = 0
+            rangos = _rango_lote(hijos, desde)
+            g_hijo = g[padre] + 1
+
+            # Filtro en bloque contra la cerrada y contra los duplicados del lote
+            # (un mismo hijo puede salir de padres con distinta g: gana la menor)
+            mejores = np.nonzero(g_hijo < costo_acumulado[rangos])[0]
+            mejores = mejores[np.lexsort((g_hijo[mejores], rangos[mejores]))]
+            rangos_m, unicos = np.unique(rangos[mejores], return_index=True)
+            mejores = mejores[unicos]
+            if not len(mejores):
+                continue
+            costo_acumulado[rangos_m] = g_hijo[mejores]
+            raiz[rangos_m] = mov[mejores]
+
+            cod_hijo = (hijos[mejores].astype(np.uint64) << despl).sum(axis=1) \
+                | (desde[mejores].astype(np.uint64) << despl_hueco)
+            if dist is not None:
+                v = fichas[mejores]
+                h_nuevo = h[padre[mejores]] + dist[v, hasta[mejores]] - dist[v, desde[mejores]]
+            else:
+                h_nuevo = np.array([
+                    h_hijo(int(hp), int(cp), int(ch), int(v), int(d), int(b))
+                    for hp, cp, ch, v, d, b in zip(h[padre[mejores]], cod[padre[mejores]], cod_hijo,
+                                                   fichas[mejores], desde[mejores], hasta[mejores])],
+                    dtype=np.int64)
+            f_nuevo = g_hijo[mejores] + h_nuevo
+
+            # Se meten agrupados por (f, h): una llamada por cubeta, no por hijo
+            orden = np.lexsort((h_nuevo, f_nuevo))
+            f_nuevo, h_nuevo, cod_hijo = f_nuevo[orden], h_nuevo[orden], cod_hijo[orden].tolist()
+            cortes = np.nonzero((np.diff(f_nuevo) != 0) | (np.diff(h_nuevo) != 0))[0] + 1
+            inicio_grupo = 0
+            for fin in cortes.tolist() + [len(cod_hijo)]:
+                abierta.extender(int(f_nuevo[inicio_grupo]), int(h_nuevo[inicio_grupo]),
+                                 cod_hijo[inicio_grupo:fin])
+                inicio_grupo = fin
+            empujes += len(cod_hijo)
+    finally:
+        if stats is not None:
+            stats.expansiones = expansions
+            stats.generados, stats.empujes = generados, empujes
+            stats.obsoletos = obsoletos
+            stats.max_abiertos = max_abiertos
+            stats.terminar(reloj)
+
+    raise ValueError("No se encontró solución (¿estado incorrecto?).")
+
+
+# --- HDA* ---
+# Cada proceso trabajador es dueño de los estados cuyo hash le toca: solo él
+# guarda su g y su movimiento padre y solo él los expande. Los sucesores de
+# otro dueño se le mandan en lotes por su buzón (una cola de multiprocessing).
+#
+# Terminación: `trabajo` cuenta los nodos en vuelo más los trabajadores
+# activos, y se modifica siempre con su lock. Enviar suma antes de meter en
+# la cola, y un trabajador que recibe suma 1 por sí mismo a la vez que resta
+# lo recibido, así que el contador no pasa por 0 mientras quede algo por
+# hacer. Cuando llega a 0 con una solución ya conocida (`incumbente`), no
+# queda ningún nodo con f < incumbente sin expandir: la solución es óptima.
+_MEZCLA = 0x9E3779B97F4A7C15  # multiplicador de Fibonacci para repartir los estados
+LOTE_HDA = 256                # nodos por mensaje entre trabajadores
+TANDA_HDA = 64                # expansiones entre lecturas del buzón
+INTERVALO_HDA = 0.01          # segundos entre revisiones del proceso principal
+ESPERA_RESPUESTA_HDA = 0.1    # segundos entre comprobaciones al esperar un "mov"
+SIN_INCUMBENTE = 1_000_000_000
+
+
+def _dueno(codigo: int, procesos: int) -> int:
+    return (((codigo * _MEZCLA) & 0xFFFFFFFFFFFFFFFF) >> 40) % procesos
+
+
+def _trabajador_hda(i: int, n: int, heur, buzones, respuestas, trabajo, incumbente,
+                    expansiones, abiertos, fronteras, parar) -> None:
+    """Bucle de un trabajador de `hdastar` (se ejecuta en su propio proceso)."""
+    geo = geometria(n)
+    bits, mascara, despl_h = geo.bits, geo.mascara, geo.despl_hueco
+    vecinos, meta = geo.vecinos, geo.codigo_meta
+    h_hijo = heur.hijo
+    procesos = len(buzones)
+    buzon = buzones[i]
+
+    costo_acumulado = _TablaDispersa(SIN_INCUMBENTE)
+    raiz: Dict[int, int] = {}
+    abierta = ColaCubetas()
+    salida: List[list] = [[] for _ in range(procesos)]
+    activo = False
+    locales = 0
+
+    def recibir(nodos) -> None:
+        for g, h, estado, mov in nodos:
+            if g < costo_acumulado[estado]:
+                costo_acumulado[estado] = g
+                raiz[estado] = mov
+                if estado == meta:
+                    with incumbente.get_lock():
+                        if g < incumbente.value:
+                            incumbente.value = g
+                elif g + h < incumbente.value:
+                    abierta.push(g + h, h, estado)
+
+    def enviar(j: int) -> None:
+        lote, salida[j] = salida[j], []
+        with trabajo.get_lock():
+            trabajo.value += len(lote)
+        buzones[j].put(("nodos", lote))
+
+    while not parar.is_set():
+        # Buzón: sin esperar si hay trabajo propio; si no, se bloquea un poco
+        while True:
+            try:
+                tipo, dato = buzon.get_nowait() if activo else buzon.get(timeout=0.05)
+            except queue.Empty:
+                break
+            if tipo == "nodos":
+                recibir(dato)
+                with trabajo.get_lock():
+                    trabajo.value += (0 if activo else 1) - len(dato)
+                activo = True
+            elif tipo == "mov":
+                respuestas.put(raiz[dato])
+            else:  # "fin"
+                return
+        if not activo:
+            continue
+
+        cota = incumbente.value
+        for _ in range(TANDA_HDA):
+            if not abierta:
+                break
+            f_actual, h_actual, actual = abierta.pop()
+            g_actual = f_actual - h_actual
+            if g_actual > costo_acumulado[actual]:
+                continue
+            if f_actual >= cota:
+                # Todo lo que queda tiene f >= cota: ya no puede mejorarla
+                abierta = ColaCubetas()
+                break
+            locales += 1
+            fronteras[i] = f_actual
+
+            tentative_g = g_actual + 1
+            hueco = actual >> despl_h
+            despl_hueco = hueco * bits
+            for move, destino, despl in vecinos[hueco]:
+                v = (actual >> despl) & mascara
+                nb = actual ^ (v << despl) ^ (v << despl_hueco) ^ ((hueco ^ destino) << despl_h)
+                nodo = (tentative_g, h_hijo(h_actual, actual, nb, v, destino, hueco),
+                        nb, INDICE_MOV[move])
+                j = _dueno(nb, procesos)
+                if j == i:
+                    recibir((nodo,))
+                else:
+                    salida[j].append(nodo)
+                    if len(salida[j]) >= LOTE_HDA:
+                        enviar(j)
+
+        for j in range(procesos):
+            if salida[j]:
+                enviar(j)
+        expansiones[i] = locales
+        abiertos[i] = len(abierta)
+        if not abierta:
+            with trabajo.get_lock():
+                trabajo.value -= 1
+            activo = False
+
+
+def hdastar(start: Tablero,
+            heuristic: Heuristic = manhattan,
+            max_expansions: int = 200000,
+            progreso: Optional[Progreso] = None,
+            stats: Optional[EstadisticasBusqueda] = None,
+            procesos: Optional[int] = None) -> Tuple[List[str], int]:
+    """HDA*: A* repartido por hash entre `procesos` procesos (uno por CPU).
+
+    Mismo contrato que `astar`; la heurística se copia a cada trabajador, así
+    que tiene que poder serializarse con pickle. Con `stats`, además de los
+    totales se guardan las expansiones de cada trabajador en `por_trabajador`.
+    Arrancar los procesos cuesta unas décimas de segundo: solo compensa en
+    búsquedas grandes (15-puzzle).
+    """
+    if not start.es_resoluble():
+        raise ValueError("El estado inicial NO es resoluble (paridad incorrecta).")
+    if stats is not None:
+        reloj = stats.empezar()
+
+    geo = start.geometria
+    heur = como_heuristica(heuristic).para(geo.n)
+    procesos = procesos or os.cpu_count() or 1
+    # spawn: el controlador puede llamar desde un hilo con Tk abierto
+    contexto = multiprocessing.get_context("spawn")
+    buzones = [contexto.Queue() for _ in range(procesos)]
+    respuestas = contexto.Queue()
+    trabajo = contexto.Value('q', 1)  # el nodo inicial, en vuelo
+    incumbente = contexto.Value('q', SIN_INCUMBENTE)
+    expansiones = contexto.Array('q', procesos)
+    abiertos = contexto.Array('q', procesos)
+    fronteras = contexto.Array('q', procesos)
+    parar = contexto.Event()
+    inicio = start.codigo()
+    h_inicio = heur.codigo(inicio)
+    trabajadores: List[multiprocessing.process.BaseProcess] = []
+    total = 0
+    try:
+        # Dentro del try: si un start falla (p. ej. al serializar la heurística),
+        # el finally cierra los que ya arrancaron
+        for i in range(procesos):
+            t = contexto.Process(target=_trabajador_hda, daemon=True,
+                                 args=(i, geo.n, heur, buzones, respuestas, trabajo, incumbente,
+                                       expansiones, abiertos, fronteras, parar))
+            t.start()
+            trabajadores.append(t)
+        buzones[_dueno(inicio, procesos)].put(("nodos", [(0, h_inicio, inicio, RAIZ)]))
+
+        while trabajo.value:
+            time.sleep(INTERVALO_HDA)
+            total = sum(expansiones)
+            if total > max_expansions:
+                raise ValueError("Se excedió el límite de expansiones.")
+            if not all(t.is_alive() for t in trabajadores):
+                raise ValueError("Un trabajador de HDA* terminó inesperadamente.")
+            if progreso is not None:
+                progreso(total, sum(abiertos), min(fronteras))
+        total = sum(expansiones)
+        if incumbente.value == SIN_INCUMBENTE:
+            raise ValueError("No se encontró solución (¿estado incorrecto?).")
+
+        # La ruta se reconstruye preguntando a cada dueño por el movimiento padre
+        movimientos: List[str] = []
+        actual = geo.codigo_meta
+        while True:
+            dueno = _dueno(actual, procesos)
+            buzones[dueno].put(("mov", actual))
+            while True:
+                try:
+                    i = respuestas.get(timeout=ESPERA_RESPUESTA_HDA)
+                    break
+                except queue.Empty:
+                    if not trabajadores[dueno].is_alive():
+                        raise ValueError(f"El trabajador {dueno} de HDA* terminó sin "
+                                         "responder al reconstruir la ruta.")
+            if i == RAIZ:
+                break
+            mov = NOMBRES_MOV[i]
+            df, dc = MOVIMIENTOS[mov]
+            actual = geo.mover(actual, geo.hueco(actual) - df * geo.n - dc)
+            movimientos.append(mov)
+        movimientos.reverse()
+        return movimientos, total
+    finally:
+        parar.set()
+        for buzon in buzones:
+            buzon.put(("fin", None))
+        for t in trabajadores:
+            t.join(timeout=1)
+            if t.is_alive():
+                t.terminate()
+        if stats is not None:
+            stats.expansiones = total
+            stats.por_trabajador = list(expansiones)
+            stats.terminar(reloj)
+
+
+_oraculo: Optional[Oraculo] = None
+
+def oraculo(start: Tablero,
+            progreso: Optional[Progreso] = None,
+            stats: Optional[EstadisticasBusqueda] = None) -> Tuple[List[str], int]:
+    """Solución óptima leída del oráculo precalculado (ver model.oraculo).
+
+    Mismo contrato que `astar`; como "expansiones" cuenta los estados por
+    los que pasa el descenso, es decir, la longitud de la ruta. `progreso`
+    se acepta por uniformidad, pero el descenso es instantáneo y no lo usa.
+    """
+    global _oraculo
+    if start.n != 3:
+        raise ValueError("El oráculo solo existe para el 8-puzzle (3x3).")
+    if not start.es_resoluble():
+        raise ValueError("El estado inicial NO es resoluble (paridad incorrecta).")
+    if stats is not None:
+        reloj = stats.empezar()
+    if _oraculo is None:
+        _oraculo = Oraculo()
+    ruta = _oraculo.ruta(start.codigo())
+    if stats is not None:
+        stats.expansiones = len(ruta)
+        stats.terminar(reloj)
+    return ruta, len(ruta)
+
+
+# Resolvedores disponibles para el controlador: nombre -> (función, etiqueta).
+# Todos aceptan el tablero y, opcionalmente, `progreso=` y `stats=`.
+SOLVERS: Dict[str, Tuple[Callable[..., Tuple[List[str], int]], str]] = {
+    "astar": (astar, "A*"),
+    "idastar": (idastar, "IDA*"),
+    "bidireccional": (bidireccional, "BFS bidireccional"),
+    "anytime": (anytime, "A* anytime"),
+    "hda": (hdastar, "HDA*"),
+    "lotes": (astar_lotes, "A* por lotes"),
+    "oraculo": (oraculo, "oráculo"),
+}
+
+# Resolvedores cuya ruta es óptima (con una heurística admisible): sus rutas
+# se pueden reutilizar, ver controller.cache.
+OPTIMOS = frozenset({"astar", "idastar", "bidireccional", "hda", "lotes", "oraculo"})
+
+# Heurísticas disponibles por nombre. Son fábricas para que las tablas de las
+# PDB solo se carguen (o construyan) cuando alguien las pide.
+HEURISTICAS: Dict[str, Callable[[], Heuristic]] = {
+    "manhattan": lambda: manhattan,
+    "conflictos": lambda: conflicto_lineal,
+    "caminata": lambda: distancia_caminata,
+    "pdb": PatronesAditivos,
+}
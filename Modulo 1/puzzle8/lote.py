@@ -0,0 +1,114 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import IO, Iterable, Iterator, List, Tuple
+from model.board import Tablero
+from controller.solver import SOLVERS
+
+# Modo por lotes sin interfaz: lee un estado inicial por línea (de un archivo
+# o de stdin), los resuelve en paralelo y escribe un JSON por línea con el
+# resultado de cada uno, en el orden en que van terminando.
+#
+#   python lote.py estados.txt --procesos 4 > resultados.jsonl
+#   echo "4 0 1 3 5 6 2 7 8" | python lote.py
+
+Entrada = Tuple[int, str]  # (número de línea, texto)
+
+
+def leer_entradas(fuente: IO[str]) -> Iterator[Entrada]:
+    """Líneas no vacías de `fuente` con su número (se ignoran las que empiezan por #)."""
+    for num, linea in enumerate(fuente, start=1):
+        linea = linea.strip()
+        if linea and not linea.startswith("#"):
+            yield num, linea
+
+
+def en_lotes(entradas: Iterable[Entrada], tam: int) -> Iterator[List[Entrada]]:
+    lote: List[Entrada] = []
+    for e in entradas:
+        lote.append(e)
+        if len(lote) == tam:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def resolver_uno(num: int, texto: str, solver: str, max_expansions: int) -> dict:
+    resultado: dict = {"linea": num}
+    inicio = time.perf_counter()
+    try:
+        board = Tablero.from_list(int(x) for x in re.split(r"[\s,]+", texto))
+        resultado["estado"] = list(board.state)
+        if not board.es_resoluble():
+            raise ValueError("El estado inicial NO es resoluble (paridad incorrecta).")
+        fn, _ = SOLVERS[solver]
+        if solver == "oraculo":
+            ruta, expansions = fn(board)
+        else:
+            ruta, expansions = fn(board, max_expansions=max_expansions)
+        resultado.update(movimientos="".join(ruta), longitud=len(ruta), expansiones=expansions)
+    except ValueError as e:
+        resultado["error"] = str(e)
+    resultado["tiempo"] = round(time.perf_counter() - inicio, 6)
+    return resultado
+
+
+def resolver_lote(lote: List[Entrada], solver: str, max_expansions: int) -> List[dict]:
+    """Trabajo de cada proceso: resolver un bloque de entradas seguidas."""
+    return [resolver_uno(num, texto, solver, max_expansions) for num, texto in lote]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Resuelve muchos puzzles sin interfaz gráfica.")
+    parser.add_argument("archivo", nargs="?", default="-",
+                        help="un estado por línea, p. ej. '4 0 1 3 5 6 2 7 8' (por defecto stdin)")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="astar")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--lote", type=int, default=32,
+                        help="estados que se envían juntos a cada proceso")
+    parser.add_argument("--max-expansiones", type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    procesos = args.procesos or os.cpu_count() or 1
+    fuente = sys.stdin if args.archivo == "-" else open(args.archivo, encoding="utf-8")
+    resueltos = errores = 0
+    inicio = time.perf_counter()
+    with fuente, ProcessPoolExecutor(max_workers=procesos) as pool:
+        # Se mantienen pocos lotes en vuelo para no leer toda la entrada de golpe
+        en_vuelo = set()
+        limite = 2 * procesos
+        pendientes = en_lotes(leer_entradas(fuente), max(1, args.lote))
+        agotado = False
+        while en_vuelo or not agotado:
+            while not agotado and len(en_vuelo) < limite:
+                lote = next(pendientes, None)
+                if lote is None:
+                    agotado = True
+                else:
+                    en_vuelo.add(pool.submit(resolver_lote, lote, args.solver, args.max_expansiones))
+            if not en_vuelo:
+                break
+            hechos, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+            for fut in hechos:
+                for resultado in fut.result():
+                    if "error" in resultado:
+                        errores += 1
+                    else:
+                        resueltos += 1
+                    sys.stdout.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+    print(f"{resueltos} resueltos, {errores} con error en "
+          f"{time.perf_counter() - inicio:.2f} s ({procesos} procesos)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+from functools import lru_cache
+from math import isqrt
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 Coord = Tuple[int, int]
-estado = Tuple[int, ...]  # tupla de 9, 0 = hueco
+estado = Tuple[int, ...]  # tupla de N*N (9 en el 8-puzzle), 0 = hueco
 
 solucion: estado = (1, 2, 3, 4, 5, 6, 7, 8, 0)
 
@@ -14,44 +16,274 @@ MOVIMIENTOS = {
     'R': (0, 1),
 }
 
+
+def solucion_de(n: int) -> estado:
+    """Estado meta de un tablero NxN: 1..N²-1 en orden y el hueco al final."""
+    return tuple(range(1, n * n)) + (0,)
+
+
+class Geometria:
+    """Tablas precalculadas de un tablero NxN.
+
+    Estado empaquetado: la casilla i ocupa los bits [bits*i, bits*i + bits)
+    (4 bits hasta el 15-puzzle, 5 en el 24-puzzle) y por encima de las N*N
+    casillas se guarda la posición del hueco, para no tener que buscarla en
+    cada expansión.
+    """
+
+    def __init__(self, n: int):
+        if n < 2:
+            raise ValueError("El tablero debe ser al menos de 2x2.")
+        self.n = n
+        self.casillas = n * n
+        self.bits = max(4, (self.casillas - 1).bit_length())
+        self.mascara = (1 << self.bits) - 1
+        self.despl_hueco = self.casillas * self.bits
+        # vecinos[p] = movimientos legales con el hueco en p, como
+        # (movimiento, casilla destino del hueco, desplazamiento en bits del destino).
+        self.vecinos: Tuple[Tuple[Tuple[str, int, int], ...], ...] = tuple(
+            self._vecinos_hueco(p) for p in range(self.casillas))
+        self.meta: estado = solucion_de(n)
+        self.codigo_meta: int = self.empaquetar(self.meta)
+
+    def _vecinos_hueco(self, p: int) -> Tuple[Tuple[str, int, int], ...]:
+        n = self.n
+        fila, columna = divmod(p, n)
+        vecinos = []
+        for m, (df, dc) in MOVIMIENTOS.items():
+            nf, nc = fila + df, columna + dc
+            if 0 <= nf < n and 0 <= nc < n:
+                destino = nf * n + nc
+                vecinos.append((m, destino, destino * self.bits))
+        return tuple(vecinos)
+
+    def empaquetar(self, state: Iterable[int]) -> int:
+        """Codifica un estado como un int de `bits` por casilla + hueco."""
+        codigo = 0
+        hueco = 0
+        for i, v in enumerate(state):
+            codigo |= v << (i * self.bits)
+            if v == 0:
+                hueco = i
+        return codigo | (hueco << self.despl_hueco)
+
+    def desempaquetar(self, codigo: int) -> estado:
+        """Inverso de `empaquetar`: devuelve la tupla de N*N valores."""
+        return tuple((codigo >> (i * self.bits)) & self.mascara for i in range(self.casillas))
+
+    def hueco(self, codigo: int) -> int:
+        """Posición del hueco en un estado empaquetado."""
+        return codigo >> self.despl_hueco
+
+    def mover(self, codigo: int, destino: int) -> int:
+        """Intercambia el hueco con la ficha de `destino` usando solo XOR.
+
+        Como el campo del hueco vale 0, basta con quitar la ficha de su casilla,
+        ponerla en la del hueco y actualizar la posición cacheada del hueco.
+        """
+        hueco = codigo >> self.despl_hueco
+        v = (codigo >> (destino * self.bits)) & self.mascara
+        return (codigo
+                ^ (v << (destino * self.bits))
+                ^ (v << (hueco * self.bits))
+                ^ ((hueco ^ destino) << self.despl_hueco))
+
+
+@lru_cache(maxsize=None)
+def geometria(n: int) -> Geometria:
+    """Geometría (compartida) del tablero NxN."""
+    return Geometria(n)
+
+
+# --- 8-PUZZLE: atajos a nivel de módulo para la geometría 3x3 ---
+GEOMETRIA_3X3 = geometria(3)
+BITS_FICHA = GEOMETRIA_3X3.bits
+MASCARA_FICHA = GEOMETRIA_3X3.mascara
+DESPL_HUECO = GEOMETRIA_3X3.despl_hueco
+VECINOS_HUECO = GEOMETRIA_3X3.vecinos
+empaquetar = GEOMETRIA_3X3.empaquetar
+desempaquetar = GEOMETRIA_3X3.desempaquetar
+hueco_codigo = GEOMETRIA_3X3.hueco
+mover_codigo = GEOMETRIA_3X3.mover
+codigo_solucion: int = GEOMETRIA_3X3.codigo_meta
+
+
+# --- RANGO: hash perfecto de permutaciones (código de Lehmer) ---
+# `rango`/`desrango` son del 8-puzzle; `rango_parcial` sirve para cualquier N.
+def tam_patron(k: int, n: int = 9) -> int:
+    """Número de colocaciones distintas de k elementos en n casillas."""
+    tam = 1
+    for i in range(k):
+        tam *= n - i
+    return tam
+
+
+def rango_parcial(posiciones: Sequence[int], n: int = 9) -> int:
+    """Hash perfecto de una colocación (valores distintos) en [0, tam_patron).
+
+    Es el código de Lehmer parcial: cada valor se numera entre los que aún no
+    han usado los elementos anteriores, en base mixta n, n-1, ...
+    """
+    idx = 0
+    usados = 0
+    for i, p in enumerate(posiciones):
+        idx = idx * (n - i) + p - bin(usados & ((1 << p) - 1)).count("1")
+        usados |= 1 << p
+    return idx
+
+
+# En un estado resoluble, el orden de las fichas (sin el hueco) es una
+# permutación par de 1..8: las 6 primeras fijan el orden de las 2 últimas.
+# Rango = posición del hueco * 8!/2 + rango de esas 6 fichas, un hash
+# perfecto de los 9!/2 estados alcanzables.
+ORDENES_FICHAS = tam_patron(6, 8)
+TOTAL_ESTADOS = 9 * ORDENES_FICHAS
+
+
+# _DIGITO[usados << 4 | v] = dígito de Lehmer de la ficha v cuando ya se han
+# usado las fichas del conjunto `usados` (máscara de bits).
+_DIGITO = [v - 1 - bin(usados & ((1 << v) - 1)).count("1") if v else 0
+           for usados in range(1 << 9) for v in range(1 << BITS_FICHA)]
+_DESPL_CASILLAS = tuple(p * BITS_FICHA for p in range(9))
+
+
+def rango(codigo: int) -> int:
+    """Rango en [0, TOTAL_ESTADOS) de un estado resoluble empaquetado."""
+    idx = 0
+    usados = 0
+    base = 8
+    for despl in _DESPL_CASILLAS:
+        v = (codigo >> despl) & MASCARA_FICHA
+        if v:
+            idx = idx * base + _DIGITO[usados << BITS_FICHA | v]
+            usados |= 1 << v
+            base -= 1
+            if base == 2:  # ya van 6 fichas
+                break
+    return (codigo >> DESPL_HUECO) * ORDENES_FICHAS + idx
+
+
+# Peso y base de cada dígito de Lehmer en el rango (posiciones 6 y 7 no cuentan)
+_PESOS_LEHMER = (2520, 360, 60, 12, 3, 1, 0, 0)
+_BASES_LEHMER = (8, 7, 6, 5, 4, 3, 2, 1)
+
+
+def rango_vertical(r: int, codigo: int, hueco: int, destino: int) -> int:
+    """Rango del hijo de `codigo` (de rango `r`) al mover el hueco en vertical.
+
+    En el orden de las fichas solo cambian tres seguidas desde la posición p:
+    la ficha movida salta por encima de las dos de en medio ([a,b,c] pasa a
+    [b,c,a] si el hueco sube, a [c,a,b] si baja). Los dígitos de Lehmer de
+    las demás no cambian, y los de esas tres se corrigen comparándolas entre
+    sí, así que no hace falta recorrer el tablero como en `rango`.
+    """
+    p = hueco if destino > hueco else destino
+    despl = (p + 1 if destino > hueco else p) * BITS_FICHA
+    a = (codigo >> despl) & MASCARA_FICHA
+    b = (codigo >> despl + BITS_FICHA) & MASCARA_FICHA
+    c = (codigo >> despl + 2 * BITS_FICHA) & MASCARA_FICHA
+    idx = r % ORDENES_FICHAS
+    w0, w1, w2 = _PESOS_LEHMER[p], _PESOS_LEHMER[p + 1], _PESOS_LEHMER[p + 2]
+    # Dígitos actuales de a, b, c; los de las posiciones 6 y 7 no están en el
+    # rango: el de la 7 es 0 y el de la 6 es si la ficha es mayor que la última
+    da = idx // w0 % _BASES_LEHMER[p]
+    if p == 5:
+        db, dc = int(b > c), 0
+    else:
+        db = idx // w1 % _BASES_LEHMER[p + 1]
+        if p < 4:
+            dc = idx // w2 % _BASES_LEHMER[p + 2]
+        else:
+            dc = int(c > (codigo >> _DESPL_CASILLAS[8]) & MASCARA_FICHA)
+    if destino < hueco:
+        delta = ((db + (a < b) - da) * w0 + (dc + (a < c) - db) * w1
+                 + (da - (b < a) - (c < a) - dc) * w2)
+    else:
+        delta = ((dc + (a < c) + (b < c) - da) * w0 + (da - (c < a) - db) * w1
+                 + (db - (c < b) - dc) * w2)
+    return r + (destino - hueco) * ORDENES_FICHAS + delta
+
+
+def _inversiones(vals: Sequence[int]) -> int:
+    arr = [x for x in vals if x != 0]
+    return sum(1 for i in range(len(arr)) for j in range(i + 1, len(arr)) if arr[i] > arr[j])
+
+
+def desrango(idx: int) -> int:
+    """Inverso de `rango`: devuelve el estado resoluble empaquetado."""
+    hueco, idx = divmod(idx, ORDENES_FICHAS)
+    digitos = []
+    for base in range(3, 9):
+        idx, d = divmod(idx, base)
+        digitos.append(d)
+    libres = list(range(1, 9))
+    fichas = [libres.pop(d) for d in reversed(digitos)] + libres
+    # Las dos últimas van en el orden que deja un número par de inversiones
+    if _inversiones(fichas) % 2:
+        fichas[6], fichas[7] = fichas[7], fichas[6]
+    fichas.insert(hueco, 0)
+    return empaquetar(fichas)
+
 @dataclass(frozen=True)
 class Tablero:
-    """Representa un estado del 8-puzzle como tupla inmutable."""
+    """Representa un estado del puzzle NxN (8-puzzle por defecto) como tupla inmutable."""
     state: estado
 
     @staticmethod
     def from_list(vals: Iterable[int]) -> "Tablero":
         t = tuple(vals)
-        if len(t) != 9 or set(t) != set(range(9)):
-            raise ValueError("El estado debe contener los números 0..8 exactamente una vez.")
+        n = isqrt(len(t))
+        if n < 2 or n * n != len(t) or set(t) != set(range(len(t))):
+            raise ValueError("El estado debe contener los números 0..N²-1 exactamente una vez "
+                             "(0..8 en el 8-puzzle).")
         return Tablero(t)
+
+    @staticmethod
+    def from_codigo(codigo: int, n: int = 3) -> "Tablero":
+        return Tablero(geometria(n).desempaquetar(codigo))
+
+    @property
+    def n(self) -> int:
+        """Ancho del tablero."""
+        return isqrt(len(self.state))
+
+    @property
+    def geometria(self) -> Geometria:
+        return geometria(self.n)
+
+    def codigo(self) -> int:
+        """Estado empaquetado (ver `Geometria.empaquetar`)."""
+        return self.geometria.empaquetar(self.state)
 ###
 
 # --- META: ¿ya está resuelto exactamente? ---
     def es_meta(self) -> bool:
-        return self.state == solucion
+        return self.state == self.geometria.meta
 
     # --- RESOLUBILIDAD: ¿tiene solución (paridad de inversiones)? ---
     def es_resoluble(self) -> bool:
-        arr = [x for x in self.state if x != 0]
-        inv = 0
-        for i in range(len(arr)):
-            for j in range(i + 1, len(arr)):
-                if arr[i] > arr[j]:
-                    inv += 1
-        return inv % 2 == 0  # 3x3: par = resoluble
+        inv = _inversiones(self.state)
+        n = self.n
+        if n % 2:
+            return inv % 2 == 0  # ancho impar: par = resoluble
+        # Ancho par: un movimiento vertical cambia a la vez la paridad de las
+        # inversiones y la fila del hueco, así que su suma se conserva y debe
+        # coincidir con la de la meta (0 inversiones, hueco en la fila n-1).
+        fila_hueco = self.state.index(0) // n
+        return (inv + fila_hueco) % 2 == (n - 1) % 2
     
 
     def index(self, value: int) -> Coord:
         i = self.state.index(value)
-        return (i // 3, i % 3)
+        return divmod(i, self.n)
 
     def movimientos_legales(self) -> List[str]:
         fila, columna = self.index(0)
+        n = self.n
         moves = []
         for move, (df, dc) in MOVIMIENTOS.items():
             newf, newc = fila + df, columna + dc
-            if 0 <= newf < 3 and 0 <= newc < 3:
+            if 0 <= newf < n and 0 <= newc < n:
                 moves.append(move)
         return moves
 
@@ -59,14 +291,15 @@ class Tablero:
         """Devuelve un nuevo Board aplicando el movimiento, o None si no es legal."""
         if m not in MOVIMIENTOS:
             return None
+        n = self.n
         r, c = self.index(0)
         dr, dc = MOVIMIENTOS[m]
         nr, nc = r + dr, c + dc
-        if not (0 <= nr < 3 and 0 <= nc < 3):
+        if not (0 <= nr < n and 0 <= nc < n):
             return None
 
-        idx0 = r * 3 + c
-        idx1 = nr * 3 + nc
+        idx0 = r * n + c
+        idx1 = nr * n + nc
         lst = list(self.state)
         lst[idx0], lst[idx1] = lst[idx1], lst[idx0]
         return Tablero(tuple(lst))
@@ -1,30 +1,321 @@
 from __future__ import annotations
-from typing import Tuple
-from .board import Tablero, solucion
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+from .board import Tablero, geometria
 
 # Position: representa una coordenada en el tablero (fila, columna).
 Position = Tuple[int, int]
 
-def manhattan(board: Tablero) -> int:
-    """Calcula la heurística Manhattan para un tablero del puzzle 8.
 
-    La distancia Manhattan de una ficha es el número de movimientos 
-    verticales y horizontales que necesita para llegar a su posición 
-    correcta en el estado objetivo. La heurística total es la suma 
+class Heuristica:
+    """Heurística que se evalúa directamente sobre estados empaquetados.
+
+    Sigue siendo un callable `Tablero -> int`, así que se puede usar en
+    cualquier sitio donde antes se pasaba una función. `hijo` permite a la
+    búsqueda obtener la h de un sucesor a partir de la del padre; por defecto
+    recalcula todo, y cada heurística lo redefine cuando sabe hacerlo mejor.
+
+    Cada instancia está construida para un ancho de tablero `n`; `para(n)`
+    devuelve la versión para otro ancho (o falla si no sabe construirla).
+    """
+    n: int = 3
+
+    def __call__(self, board: Tablero) -> int:
+        return self.para(board.n).codigo(board.codigo())
+
+    def para(self, n: int) -> "Heuristica":
+        """Versión de esta heurística para tableros NxN."""
+        if n != self.n:
+            raise ValueError(f"{type(self).__name__} está construida para tableros "
+                             f"{self.n}x{self.n}, no {n}x{n}.")
+        return self
+
+    def codigo(self, codigo: int) -> int:
+        raise NotImplementedError
+
+    def hijo(self, h_padre: int, padre: int, hijo: int,
+             ficha: int, desde: int, hasta: int) -> int:
+        """h de `hijo`, obtenido de `padre` moviendo `ficha` de `desde` a `hasta`."""
+        return self.codigo(hijo)
+
+
+def _tabla_manhattan(n: int) -> Tuple[Tuple[int, ...], ...]:
+    # DIST[v][p] = distancia Manhattan de la ficha v en la casilla p a su meta.
+    # La fila del 0 vale 0: el hueco no se cuenta.
+    meta = geometria(n).meta
+    casillas = n * n
+    tabla = [[0] * casillas for _ in range(casillas)]
+    for v in range(1, casillas):
+        r2, c2 = divmod(meta.index(v), n)
+        for p in range(casillas):
+            r1, c1 = divmod(p, n)
+            tabla[v][p] = abs(r1 - r2) + abs(c1 - c2)
+    return tuple(tuple(fila) for fila in tabla)
+
+
+class Manhattan(Heuristica):
+    """Calcula la heurística Manhattan para un tablero del puzzle NxN.
+
+    La distancia Manhattan de una ficha es el número de movimientos
+    verticales y horizontales que necesita para llegar a su posición
+    correcta en el estado objetivo. La heurística total es la suma
     de estas distancias para todas las fichas.
 
+    Las distancias salen de una tabla precalculada (ficha, casilla), y al
+    mover una sola ficha la h del hijo es la del padre ± 1.
+    """
+
+    def __init__(self, n: int = 3):
+        geo = geometria(n)
+        self.n = n
+        self.dist = _tabla_manhattan(n)
+        self._bits = geo.bits
+        self._mascara = geo.mascara
+        self._casillas = geo.casillas
+
+    def para(self, n: int) -> "Manhattan":
+        return self if n == self.n else _manhattan(n)
+
+    def codigo(self, codigo: int) -> int:
+        dist = 0
+        tabla, bits, mascara = self.dist, self._bits, self._mascara
+        for p in range(self._casillas):
+            dist += tabla[(codigo >> (p * bits)) & mascara][p]
+        return dist
+
+    def hijo(self, h_padre: int, padre: int, hijo: int,
+             ficha: int, desde: int, hasta: int) -> int:
+        fila = self.dist[ficha]
+        return h_padre + fila[hasta] - fila[desde]
+
+
+@lru_cache(maxsize=None)
+def _manhattan(n: int) -> Manhattan:
+    return Manhattan(n)
+
+manhattan = _manhattan(3)
+DIST_MANHATTAN = manhattan.dist
+
+
+def _menos_a_quitar(metas: List[int]) -> int:
+    # Fichas que hay que sacar de la línea para que las demás queden en orden:
+    # cuántas hay menos la subsecuencia creciente más larga.
+    mejor = [1] * len(metas)
+    for i in range(len(metas)):
+        for j in range(i):
+            if metas[j] < metas[i] and mejor[j] + 1 > mejor[i]:
+                mejor[i] = mejor[j] + 1
+    return len(metas) - max(mejor, default=0)
+
+
+class ConflictoLineal(Manhattan):
+    """Manhattan más los conflictos lineales.
+
+    Dos fichas están en conflicto si las dos están en su fila (o columna) meta
+    pero en orden invertido: una tiene que salir de la línea para dejar pasar
+    a la otra, lo que cuesta 2 movimientos que Manhattan no cuenta. Por línea
+    se suma 2 × (mínimo de fichas a sacar para que el resto quede en orden).
+
+    Cada línea se resume en una clave (la columna/fila meta de cada ficha que
+    ya está en su línea meta, en base n + 1) y el número de fichas a sacar se
+    lee de una tabla precalculada. Un movimiento solo puede cambiar la línea
+    meta en la que entra o de la que sale la ficha, así que `hijo` relee una
+    sola línea como mucho.
     """
-    dist = 0
-    # Recorre fichas del 1 al 8 (el 0 es el espacio vacío, no se cuenta).
-    for v in range(1, 9):
-        # Posición actual de la ficha v
-        r1, c1 = board.index(v)
 
-        # Posición objetivo de la ficha v en el estado solución
-        idx_solu = solucion.index(v)
-        r2, c2 = idx_solu // 3, idx_solu % 3
+    def __init__(self, n: int = 3):
+        super().__init__(n)
+        geo = geometria(n)
+        base = n + 1
+        self._lineas = tuple(
+            tuple(tuple((p, p * geo.bits) for p in range(r * n, r * n + n)) for r in range(n))
+            + tuple(tuple((p, p * geo.bits) for p in range(c, geo.casillas, n)) for c in range(n)))
+        # aporte[v][p] = (línea, valor que suma v en p a la clave de esa línea),
+        # una entrada por la fila y otra por la columna de p.
+        self._aporte = [[((0, 0), (0, 0))] * geo.casillas]
+        for v in range(1, geo.casillas):
+            mr, mc = divmod(geo.meta.index(v), n)
+            fila = []
+            for p in range(geo.casillas):
+                r, c = divmod(p, n)
+                fila.append(((r, (mc + 1) * base ** c if r == mr else 0),
+                             (n + c, (mr + 1) * base ** r if c == mc else 0)))
+            self._aporte.append(fila)
+        self._a_quitar = bytes(
+            _menos_a_quitar([d - 1 for d in (clave // base ** i % base for i in range(n)) if d])
+            for clave in range(base ** n))
+
+    def para(self, n: int) -> "ConflictoLineal":
+        return self if n == self.n else _conflicto_lineal(n)
+
+    def _clave(self, codigo: int, linea: int) -> int:
+        aporte, mascara = self._aporte, self._mascara
+        clave = 0
+        for p, despl in self._lineas[linea]:
+            clave += aporte[(codigo >> despl) & mascara][p][linea >= self.n][1]
+        return clave
 
-        # Distancia Manhattan de la ficha actual a su meta
-        dist += abs(r1 - r2) + abs(c1 - c2)
+    def codigo(self, codigo: int) -> int:
+        a_quitar = self._a_quitar
+        conflictos = sum(a_quitar[self._clave(codigo, l)] for l in range(2 * self.n))
+        return super().codigo(codigo) + 2 * conflictos
 
+    def hijo(self, h_padre: int, padre: int, hijo: int,
+             ficha: int, desde: int, hasta: int) -> int:
+        h = super().hijo(h_padre, padre, hijo, ficha, desde, hasta)
+        # Un movimiento horizontal no cambia el orden dentro de la fila (el
+        # hueco no cuenta) y uno vertical no lo cambia dentro de la columna;
+        # solo importa la columna (o fila) de la que sale o en la que entra.
+        k = 1 if desde // self.n == hasta // self.n else 0
+        (linea, sale), (linea_entra, entra) = self._aporte[ficha][desde][k], self._aporte[ficha][hasta][k]
+        if sale:
+            clave = self._clave(padre, linea)
+            return h + 2 * (self._a_quitar[clave - sale] - self._a_quitar[clave])
+        if entra:
+            clave = self._clave(padre, linea_entra)
+            return h + 2 * (self._a_quitar[clave + entra] - self._a_quitar[clave])
+        return h
+
+
+@lru_cache(maxsize=None)
+def _conflicto_lineal(n: int) -> ConflictoLineal:
+    return ConflictoLineal(n)
+
+conflicto_lineal = _conflicto_lineal(3)
+
+
+def _tabla_caminata(n: int) -> Dict[int, int]:
+    """BFS sobre las configuraciones de filas de la distancia de caminata.
+
+    Una configuración es la matriz M[i][j] = fichas en la fila i cuya fila
+    meta es j, más la fila del hueco; un movimiento vertical cambia una ficha
+    de la fila vecina a la del hueco. Cada M[i][j] ocupa 3 bits de la clave y
+    la fila del hueco va encima. Por simetría la misma tabla sirve para las
+    columnas.
+    """
+    despl_hueco = 3 * n * n
+    meta = sum(n << 3 * (i * n + i) for i in range(n)) - (1 << 3 * (n * n - 1))
+    meta |= (n - 1) << despl_hueco
+    dist = {meta: 0}
+    cola = deque([meta])
+    while cola:
+        clave = cola.popleft()
+        d = dist[clave] + 1
+        b = clave >> despl_hueco
+        for b2 in (b - 1, b + 1):
+            if not 0 <= b2 < n:
+                continue
+            base = clave + ((b2 - b) << despl_hueco)
+            for j in range(n):
+                if (clave >> 3 * (b2 * n + j)) & 7:
+                    nueva = base - (1 << 3 * (b2 * n + j)) + (1 << 3 * (b * n + j))
+                    if nueva not in dist:
+                        dist[nueva] = d
+                        cola.append(nueva)
     return dist
+
+
+class DistanciaCaminata(Heuristica):
+    """Distancia de caminata (walking distance) de Takahashi.
+
+    Ignora las columnas y cuenta los movimientos verticales que hacen falta
+    para que cada ficha llegue a su fila meta, pero respetando que solo se
+    puede intercambiar con el hueco; lo mismo con las columnas para los
+    horizontales. Los dos valores salen de una tabla de BFS (ver
+    `_tabla_caminata`) y su suma domina a Manhattan.
+
+    Un movimiento vertical solo cambia la parte de filas y uno horizontal la
+    de columnas, así que `hijo` vuelve a buscar una sola de las dos. Las
+    claves del último padre se guardan: los solvers generan todos los hijos
+    de un nodo seguidos y así el tablero se recorre una vez por padre, no una
+    por hijo. Solo hasta el 15-puzzle: en 5x5 la tabla ya no cabe en memoria.
+    """
+
+    def __init__(self, n: int = 3):
+        if n > 4:
+            raise ValueError("La distancia de caminata solo está disponible hasta 4x4.")
+        geo = geometria(n)
+        self.n = n
+        self.tabla = _tabla_caminata(n)
+        self._despl = tuple(p * geo.bits for p in range(geo.casillas))
+        self._mascara = geo.mascara
+        self._despl_hueco = 3 * n * n
+        # peso[0][v][p] suma 1 a M[fila de p][fila meta de v]; peso[1] igual con columnas
+        self._peso: Tuple[List[List[int]], List[List[int]]] = ([[0] * geo.casillas], [[0] * geo.casillas])
+        for v in range(1, geo.casillas):
+            mr, mc = divmod(geo.meta.index(v), n)
+            self._peso[0].append([1 << 3 * (p // n * n + mr) for p in range(geo.casillas)])
+            self._peso[1].append([1 << 3 * (p % n * n + mc) for p in range(geo.casillas)])
+        # (padre, (clave de filas, clave de columnas)); se reemplaza entera para
+        # que otro hilo nunca vea un padre con las claves de otro
+        self._ultimo: Tuple[int, Tuple[int, int]] = (-1, (0, 0))
+
+    def para(self, n: int) -> "DistanciaCaminata":
+        return self if n == self.n else _distancia_caminata(n)
+
+    def _claves(self, codigo: int) -> Tuple[int, int]:
+        """Claves de filas y de columnas de `codigo`, en una sola pasada."""
+        filas, columnas, mascara = self._peso[0], self._peso[1], self._mascara
+        clave_f = clave_c = 0
+        hueco = 0
+        for p, despl in enumerate(self._despl):
+            v = (codigo >> despl) & mascara
+            if v:
+                clave_f += filas[v][p]
+                clave_c += columnas[v][p]
+            else:
+                hueco = p
+        fila, columna = divmod(hueco, self.n)
+        return clave_f | fila << self._despl_hueco, clave_c | columna << self._despl_hueco
+
+    def codigo(self, codigo: int) -> int:
+        clave_f, clave_c = self._claves(codigo)
+        return self.tabla[clave_f] + self.tabla[clave_c]
+
+    def hijo(self, h_padre: int, padre: int, hijo: int,
+             ficha: int, desde: int, hasta: int) -> int:
+        n = self.n
+        if desde // n == hasta // n:
+            eje, antes, despues = 1, hasta % n, desde % n
+        else:
+            eje, antes, despues = 0, hasta // n, desde // n
+        ultimo, claves = self._ultimo
+        if ultimo != padre:
+            claves = self._claves(padre)
+            self._ultimo = (padre, claves)
+        clave = claves[eje]
+        peso = self._peso[eje][ficha]
+        nueva = clave - peso[desde] + peso[hasta] + ((despues - antes) << self._despl_hueco)
+        return h_padre - self.tabla[clave] + self.tabla[nueva]
+
+
+@lru_cache(maxsize=None)
+def _distancia_caminata(n: int) -> DistanciaCaminata:
+    return DistanciaCaminata(n)
+
+distancia_caminata = _distancia_caminata(3)
+
+
+class _HeuristicaTablero(Heuristica):
+    """Adapta una función `Tablero -> int` cualquiera a `Heuristica`."""
+
+    def __init__(self, fn: Callable[[Tablero], int], n: int = 3):
+        self.fn = fn
+        self.n = n
+
+    def __call__(self, board: Tablero) -> int:
+        return self.fn(board)
+
+    def para(self, n: int) -> "_HeuristicaTablero":
+        return self if n == self.n else _HeuristicaTablero(self.fn, n)
+
+    def codigo(self, codigo: int) -> int:
+        return self.fn(Tablero.from_codigo(codigo, self.n))
+
+
+def como_heuristica(heuristic: Callable[[Tablero], int]) -> Heuristica:
+    """Devuelve `heuristic` como `Heuristica`, envolviéndola si hace falta."""
+    if isinstance(heuristic, Heuristica):
+        return heuristic
+    return _HeuristicaTablero(heuristic)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from collections import deque
+from typing import List
+from .board import (TOTAL_ESTADOS, VECINOS_HUECO, codigo_solucion, hueco_codigo,
+                    mover_codigo, rango)
+from .heuristics import Heuristica
+from .persistencia import Tabla, cargar_tabla
+
+# Oráculo exacto del 8-puzzle: la distancia óptima a `solucion` de los 9!/2
+# estados resolubles, un byte por estado indexado por `board.rango`.
+
+NOMBRE_ARCHIVO = "oraculo_3x3.bin"
+NO_VISTO = 0xFF
+
+
+def construir_oraculo() -> bytearray:
+    """Un único BFS desde `solucion` sobre todo el espacio de estados."""
+    dist = bytearray([NO_VISTO]) * TOTAL_ESTADOS
+    dist[rango(codigo_solucion)] = 0
+    cola = deque([codigo_solucion])
+    while cola:
+        actual = cola.popleft()
+        d = dist[rango(actual)] + 1
+        for _, destino, _ in VECINOS_HUECO[hueco_codigo(actual)]:
+            nb = mover_codigo(actual, destino)
+            r = rango(nb)
+            if dist[r] == NO_VISTO:
+                dist[r] = d
+                cola.append(nb)
+    return dist
+
+
+class Oraculo(Heuristica):
+    """Tabla de distancias exactas, mapeada con mmap desde el directorio de caché.
+
+    Como heurística es perfecta (h = h*); además `ruta` devuelve una solución
+    óptima bajando por la tabla, sin búsqueda.
+    """
+
+    def __init__(self):
+        self.tabla: Tabla = cargar_tabla(NOMBRE_ARCHIVO, TOTAL_ESTADOS, construir_oraculo)
+
+    def codigo(self, codigo: int) -> int:
+        return self.tabla[rango(codigo)]
+
+    def ruta(self, codigo: int) -> List[str]:
+        """Descenso voraz: en cada paso, el vecino que está a distancia d - 1."""
+        tabla = self.tabla
+        d = tabla[rango(codigo)]
+        movimientos: List[str] = []
+        while d:
+            for move, destino, _ in VECINOS_HUECO[hueco_codigo(codigo)]:
+                nb = mover_codigo(codigo, destino)
+                if tabla[rango(nb)] == d - 1:
+                    break
+            else:
+                raise ValueError("Tabla del oráculo inconsistente; borra la caché.")
+            movimientos.append(move)
+            codigo = nb
+            d -= 1
+        return movimientos
+
+    def por_profundidad(self) -> List[List[int]]:
+        """Rangos de todos los estados agrupados por distancia óptima (0..31)."""
+        grupos: List[List[int]] = []
+        for r, d in enumerate(bytes(self.tabla)):
+            while len(grupos) <= d:
+                grupos.append([])
+            grupos[d].append(r)
+        return grupos
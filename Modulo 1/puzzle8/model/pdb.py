@@ -0,0 +1,133 @@
+from __future__ import annotations
+from collections import deque
+from typing import List, Optional, Sequence, Tuple
+from .board import geometria, rango_parcial, tam_patron
+from .heuristics import Heuristica
+from .persistencia import Tabla, cargar_tabla
+
+# Bases de datos de patrones (PDB) aditivas y disjuntas.
+#
+# Cada grupo de fichas tiene su tabla: para cada colocación de las fichas del
+# grupo y del hueco guarda el mínimo de movimientos *de fichas del grupo*
+# necesarios para llevarlas a su meta. Como cada movimiento del puzzle mueve
+# una sola ficha, las tablas de grupos disjuntos se pueden sumar sin dejar de
+# ser admisibles. El hueco forma parte del índice para que la suma sea
+# además consistente (un movimiento cambia un solo grupo, y en ±1 como mucho).
+
+Grupo = Tuple[int, ...]
+
+GRUPOS_DEFECTO: Tuple[Grupo, ...] = ((1, 2, 3, 4), (5, 6, 7, 8))
+
+NO_VISTO = 0xFF
+
+
+def grupos_defecto(n: int) -> Tuple[Grupo, ...]:
+    """Partición por defecto: 4-4 en el 8-puzzle, 5-5-5 en el 15-puzzle y
+    grupos de 3 en tableros mayores (con más fichas por grupo las tablas ya
+    no caben en memoria ni se construyen en un tiempo razonable en Python)."""
+    if n == 3:
+        return GRUPOS_DEFECTO
+    k = 5 if n == 4 else 3
+    fichas = list(range(1, n * n))
+    return tuple(tuple(fichas[i:i + k]) for i in range(0, len(fichas), k))
+
+
+def construir_patron(grupo: Grupo, n: int = 3) -> bytearray:
+    """BFS retrógrado 0-1 desde la meta NxN sobre (fichas del grupo, hueco).
+
+    Mover una ficha que no es del grupo cuesta 0 y mover una del grupo
+    cuesta 1, así que la cola doble procesa los estados por coste creciente.
+    """
+    geo = geometria(n)
+    casillas = geo.casillas
+    vecinos = geo.vecinos
+    k = len(grupo)
+    tabla = bytearray([NO_VISTO]) * tam_patron(k + 1, casillas)
+    inicio = tuple(geo.meta.index(v) for v in grupo) + (geo.meta.index(0),)
+    tabla[rango_parcial(inicio, casillas)] = 0
+    cola = deque([(inicio, 0)])
+
+    while cola:
+        posiciones, d = cola.popleft()
+        if d > tabla[rango_parcial(posiciones, casillas)]:
+            continue
+        hueco = posiciones[k]
+        for _, destino, _ in vecinos[hueco]:
+            nuevas = list(posiciones)
+            nuevas[k] = destino
+            coste = 0
+            if destino in posiciones:
+                # La ficha del grupo que estaba en `destino` pasa al hueco
+                nuevas[posiciones.index(destino)] = hueco
+                coste = 1
+            nuevas_t = tuple(nuevas)
+            idx = rango_parcial(nuevas_t, casillas)
+            if d + coste < tabla[idx]:
+                tabla[idx] = d + coste
+                if coste:
+                    cola.append((nuevas_t, d + 1))
+                else:
+                    cola.appendleft((nuevas_t, d))
+    return tabla
+
+
+class PatronesAditivos(Heuristica):
+    """Suma de bases de patrones disjuntas, cargadas con mmap desde disco.
+
+    La primera vez se construyen las tablas (ver `construir_patron`) y se
+    guardan en el directorio de caché; después arrancar es instantáneo.
+    En el 15-puzzle cada grupo de 5 fichas ocupa unos 5,7 MB y tarda unos
+    minutos en construirse.
+    """
+
+    def __init__(self, grupos: Optional[Sequence[Sequence[int]]] = None, n: int = 3):
+        geo = geometria(n)
+        self.n = n
+        self.grupos: Tuple[Grupo, ...] = tuple(tuple(g) for g in (grupos or grupos_defecto(n)))
+        fichas = [v for g in self.grupos for v in g]
+        if len(fichas) != len(set(fichas)) or not set(fichas) <= set(range(1, geo.casillas)):
+            raise ValueError(f"Los grupos deben ser disjuntos y contener fichas 1..{geo.casillas - 1}.")
+
+        self._casillas = geo.casillas
+        self._bits = geo.bits
+        self._mascara = geo.mascara
+        self.tablas: List[Tabla] = []
+        # grupo_de[v] = índice del grupo de la ficha v (-1 si no está en ninguno)
+        self.grupo_de = [-1] * geo.casillas
+        for i, g in enumerate(self.grupos):
+            nombre = f"pdb_{n}x{n}_" + "-".join(map(str, g)) + ".bin"
+            self.tablas.append(cargar_tabla(nombre, tam_patron(len(g) + 1, geo.casillas),
+                                            lambda g=g: construir_patron(g, n)))
+            for v in g:
+                self.grupo_de[v] = i
+
+    def __reduce__(self):
+        # Al copiarla a otro proceso se vuelven a mapear las tablas de la caché
+        return type(self), (self.grupos, self.n)
+
+    def _posiciones(self, codigo: int) -> List[int]:
+        pos = [0] * self._casillas
+        bits, mascara = self._bits, self._mascara
+        for p in range(self._casillas):
+            pos[(codigo >> (p * bits)) & mascara] = p
+        return pos
+
+    def _valor(self, i: int, pos: List[int]) -> int:
+        g = self.grupos[i]
+        return self.tablas[i][rango_parcial([pos[v] for v in g] + [pos[0]], self._casillas)]
+    def codigo(self, codigo: int) -> int:
+        pos = self._posiciones(codigo)
+        return sum(self._valor(i, pos) for i in range(len(self.grupos)))
+
+    def hijo(self, h_padre: int, padre: int, hijo: int,
+             ficha: int, desde: int, hasta: int) -> int:
+        # Si la ficha movida no es de ningún grupo, para todos fue un
+        # movimiento de coste 0 y ninguna tabla cambia.
+        i = self.grupo_de[ficha]
+        if i < 0:
+            return h_padre
+        pos = self._posiciones(hijo)
+        despues = self._valor(i, pos)
+        # En el padre la ficha estaba en `desde` y el hueco en `hasta`
+        pos[ficha], pos[0] = desde, hasta
+        return h_padre - self._valor(i, pos) + despues
@@ -0,0 +1,46 @@
+from __future__ import annotations
+import mmap
+import os
+from pathlib import Path
+from typing import Callable, Union
+
+# Tablas precalculadas (bases de patrones, oráculo...) que se construyen una
+# vez y después se cargan con mmap al arrancar.
+Tabla = Union[mmap.mmap, bytearray]
+
+
+def directorio_cache() -> Path:
+    """Directorio de las tablas en disco (se puede cambiar con PUZZLE8_CACHE)."""
+    return Path(os.environ.get("PUZZLE8_CACHE", Path.home() / ".cache" / "puzzle8"))
+
+
+def _mapear(ruta: Path) -> mmap.mmap:
+    with open(ruta, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def cargar_tabla(nombre: str, tam: int, construir: Callable[[], bytearray]) -> Tabla:
+    """Devuelve la tabla `nombre` (de `tam` bytes) mapeada en memoria.
+
+    Si el archivo no existe o tiene otro tamaño, se construye con `construir`
+    y se guarda. Si no se puede escribir en el directorio de caché se usa la
+    tabla recién construida en memoria.
+    """
+    ruta = directorio_cache() / nombre
+    try:
+        if ruta.stat().st_size == tam:
+            return _mapear(ruta)
+    except OSError:
+        pass
+
+    datos = construir()
+    if len(datos) != tam:
+        raise ValueError(f"La tabla {nombre} debe ocupar {tam} bytes, no {len(datos)}.")
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ruta.with_name(f"{ruta.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(datos)
+        os.replace(tmp, ruta)
+        return _mapear(ruta)
+    except OSError:
+        return datos
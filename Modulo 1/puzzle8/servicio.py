@@ -0,0 +1,244 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, List
+from model.board import Tablero
+from controller.cache import CacheRutas
+from controller.solver import OPTIMOS, SOLVERS
+from lote import en_lotes, resolver_lote
+
+# Servicio HTTP local (solo 127.0.0.1) para resolver puzzles desde otras
+# herramientas sin importar Tk. Las búsquedas corren en un pool de procesos;
+# las rutas óptimas se guardan en una caché LRU (ver controller.cache), así
+# que cualquier estado de una solución anterior se contesta sin buscar.
+#
+#   python servicio.py --puerto 8765 --procesos 4
+#   curl -d '{"estado": [4,0,1,3,5,6,2,7,8]}' localhost:8765/resolver
+#   curl -d '{"estados": [[...], [...]], "solver": "idastar"}' localhost:8765/resolver
+#   curl localhost:8765/estadisticas
+
+# Latencias que se guardan para los percentiles de /estadisticas
+MUESTRAS_LATENCIA = 1000
+
+
+class ServicioOcupado(Exception):
+    """Ya hay `max_concurrentes` peticiones resolviéndose."""
+
+
+class ErrorTrabajador(Exception):
+    """Un lote falló en el pool con algo que no es un estado incorrecto."""
+
+
+class Servicio:
+    """Pool de procesos + caché + contadores, compartido por los hilos del servidor."""
+
+    def __init__(self, procesos: int, max_concurrentes: int, tam_lote: int,
+                 max_expansions: int, capacidad_cache: int):
+        self.procesos = procesos
+        self.tam_lote = max(1, tam_lote)
+        self.max_expansions = max_expansions
+        self.pool = ProcessPoolExecutor(max_workers=procesos)
+        self._lock_pool = threading.Lock()
+        self._cupo = threading.BoundedSemaphore(max_concurrentes)
+        self._lock = threading.Lock()  # protege la caché y los contadores
+        self.cache = CacheRutas(capacidad_cache)
+        self.inicio = time.perf_counter()
+        self.peticiones = self.rechazadas = 0
+        self.resueltos = self.errores = self.de_cache = 0
+        self.en_curso = 0
+        self._latencias: Deque[float] = deque(maxlen=MUESTRAS_LATENCIA)
+
+    def resolver(self, estados: List[list], solver: str) -> List[dict]:
+        """Resuelve `estados` (en orden) con `solver`; lanza ServicioOcupado si no hay cupo."""
+        if not self._cupo.acquire(blocking=False):
+            with self._lock:
+                self.rechazadas += 1
+            raise ServicioOcupado()
+        inicio = time.perf_counter()
+        try:
+            with self._lock:
+                self.peticiones += 1
+                self.en_curso += 1
+            resultados: List[dict] = [{} for _ in estados]
+            pendientes = []
+            for i, estado in enumerate(estados):
+                ruta = self._de_cache(estado) if solver in OPTIMOS else None
+                if ruta is None:
+                    pendientes.append((i, " ".join(map(str, estado))))
+                else:
+                    resultados[i] = {"estado": list(estado), "movimientos": "".join(ruta),
+                                     "longitud": len(ruta), "expansiones": 0, "cache": True}
+
+            # El resto va al pool en lotes, como en lote.py
+            # Los estados incorrectos ya vuelven como {"error": ...}; las
+            # excepciones de aquí son lo inesperado (RecursionError, un proceso
+            # muerto...) y se contestan con un 500
+            pool = self.pool
+            futuros = []
+            fallo = None
+            try:
+                for lote in en_lotes(pendientes, self.tam_lote):
+                    futuros.append(pool.submit(resolver_lote, lote, solver, self.max_expansions))
+            except Exception as e:
+                fallo = e
+            for fut in futuros:
+                try:
+                    lote_resuelto = fut.result()
+                except Exception as e:
+                    fallo = fallo or e
+                    continue
+                for r in lote_resuelto:
+                    i = r.pop("linea")
+                    resultados[i] = r
+                    if "error" not in r and solver in OPTIMOS:
+                        with self._lock:
+                            self.cache.guardar(Tablero(tuple(r["estado"])), list(r["movimientos"]))
+            if fallo is not None:
+                if isinstance(fallo, BrokenProcessPool):
+                    self._renovar_pool(pool)
+                with self._lock:
+                    self.errores += len(estados)
+                raise ErrorTrabajador(f"{type(fallo).__name__}: {fallo}")
+
+            with self._lock:
+                errores = sum("error" in r for r in resultados)
+                self.errores += errores
+                self.resueltos += len(resultados) - errores
+                self.de_cache += len(estados) - len(pendientes)
+            return resultados
+        finally:
+            with self._lock:
+                self.en_curso -= 1
+                self._latencias.append(time.perf_counter() - inicio)
+            self._cupo.release()
+
+    def _renovar_pool(self, roto: ProcessPoolExecutor) -> None:
+        """Cambia un pool roto por uno nuevo (solo la primera petición que lo note)."""
+        with self._lock_pool:
+            if self.pool is roto:
+                self.pool = ProcessPoolExecutor(max_workers=self.procesos)
+                roto.shutdown(wait=False, cancel_futures=True)
+
+    def _de_cache(self, estado: list):
+        try:
+            tablero = Tablero.from_list(estado)
+        except (TypeError, ValueError):
+            return None  # el trabajador devolverá el error
+        with self._lock:
+            return self.cache.get(tablero)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            latencias = sorted(self._latencias)
+            transcurrido = time.perf_counter() - self.inicio
+
+            def percentil(p: float) -> float:
+                if not latencias:
+                    return 0.0
+                return round(latencias[min(len(latencias) - 1, int(p * len(latencias)))], 6)
+
+            return {
+                "procesos": self.procesos,
+                "en_curso": self.en_curso,
+                "peticiones": self.peticiones,
+                "rechazadas": self.rechazadas,
+                "resueltos": self.resueltos,
+                "errores": self.errores,
+                "de_cache": self.de_cache,
+                "estados_en_cache": len(self.cache),
+                "resueltos_por_s": round(self.resueltos / transcurrido, 3) if transcurrido else 0.0,
+                "latencia_s": {"p50": percentil(0.5), "p95": percentil(0.95),
+                               "max": round(latencias[-1], 6) if latencias else 0.0},
+                "activo_s": round(transcurrido, 3),
+            }
+
+
+class Manejador(BaseHTTPRequestHandler):
+    servicio: Servicio  # lo asigna `main`
+
+    def _responder(self, codigo: int, datos: dict) -> None:
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_GET(self):
+        if self.path == "/estadisticas":
+            self._responder(200, self.servicio.estadisticas())
+        else:
+            self._responder(404, {"error": "Ruta desconocida (usa /resolver o /estadisticas)."})
+
+    def do_POST(self):
+        if self.path != "/resolver":
+            self._responder(404, {"error": "Ruta desconocida (usa /resolver o /estadisticas)."})
+            return
+        try:
+            largo = int(self.headers.get("Content-Length") or 0)
+            peticion = json.loads(self.rfile.read(largo) or b"{}")
+            solver = peticion.get("solver", "astar")
+            if solver not in SOLVERS:
+                raise ValueError(f"Solver desconocido: {solver}")
+            if "estados" in peticion:
+                estados, varios = peticion["estados"], True
+            else:
+                estados, varios = [peticion["estado"]], False
+            if not isinstance(estados, list) or not all(isinstance(e, list) for e in estados):
+                raise ValueError("Cada estado debe ser una lista de enteros.")
+        except (ValueError, KeyError, AttributeError) as e:
+            self._responder(400, {"error": f"Petición incorrecta: {e}"})
+            return
+        try:
+            resultados = self.servicio.resolver(estados, solver)
+        except ServicioOcupado:
+            self._responder(503, {"error": "Demasiadas búsquedas en curso; reintenta más tarde."})
+            return
+        except ErrorTrabajador as e:
+            self._responder(500, {"error": f"Fallo al resolver: {e}"})
+            return
+        self._responder(200, {"resultados": resultados} if varios else resultados[0])
+
+    def log_message(self, format, *args):
+        pass  # sin una línea en stderr por petición
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Servicio HTTP local para resolver puzzles.")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--max-concurrentes", type=int, default=16,
+                        help="peticiones resolviéndose a la vez; las demás reciben 503")
+    parser.add_argument("--lote", type=int, default=8,
+                        help="estados de una misma petición que se envían juntos a cada proceso")
+    parser.add_argument("--max-expansiones", type=int, default=200000)
+    parser.add_argument("--cache", type=int, default=100000,
+                        help="estados que guarda la caché de rutas")
+    args = parser.parse_args(argv)
+
+    procesos = args.procesos or os.cpu_count() or 1
+    Manejador.servicio = Servicio(procesos, args.max_concurrentes, args.lote,
+                                  args.max_expansiones, args.cache)
+    servidor = ThreadingHTTPServer(("127.0.0.1", args.puerto), Manejador)
+    print(f"Escuchando en http://127.0.0.1:{args.puerto} ({procesos} procesos)", file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        Manejador.servicio.pool.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 from __future__ import annotations
 import tkinter as tk
 from tkinter import messagebox
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
 from model.board import Tablero
 
 Tile = list[list[tk.Label]]
@@ -17,31 +17,26 @@ class GUIView:
         self._frame = tk.Frame(self.root, padx=12, pady=12)
         self._frame.grid(row=0, column=0)
 
-        # Panel tablero 3x3
+        # Panel tablero NxN (las fichas se crean con el primer render)
         self.grid_frame = tk.Frame(self._frame, bd=2, relief="groove")
         self.grid_frame.grid(row=0, column=0, columnspan=4, pady=(0, 10))
-        self.tiles: Tile = [[None]*3 for _ in range(3)]  # type: ignore
+        self.tiles: Tile = []
+        # Último estado dibujado: render solo toca las casillas que cambiaron
+        self._dibujado: Optional[Tuple[int, ...]] = None
 
         self.moves_label = tk.Label(self._frame, text="Movimientos (A*): 0", anchor="w")
         self.moves_label.grid(row=2, column=0, columnspan=2, sticky="w", pady=(4, 0))
 
-        for r in range(3):
-            for c in range(3):
-                lbl = tk.Label(self.grid_frame, text="",
-                               width=4, height=2,
-                               font=("Segoe UI", 20, "bold"),
-                               bd=1, relief="ridge", padx=10, pady=10,
-                               bg="#ffffff")
-                lbl.grid(row=r, column=c, padx=4, pady=4, sticky="nsew")
-                self.tiles[r][c] = lbl
-
         # Botones
         self.btn_shuffle = tk.Button(self._frame, text="Barajar", width=10, command=lambda: None)
         self.btn_solve   = tk.Button(self._frame, text="Resolver A*", width=12, command=lambda: None)
+        self.btn_cancel  = tk.Button(self._frame, text="Cancelar", width=10, command=lambda: None,
+                                     state="disabled")
         self.btn_quit    = tk.Button(self._frame, text="Salir", width=10, command=self.root.destroy)
             
         self.btn_shuffle.grid(row=1, column=0, padx=4)
         self.btn_solve.grid(row=1, column=1, padx=4)
+        self.btn_cancel.grid(row=1, column=2, padx=4)
         self.btn_quit.grid(row=1, column=3, padx=4)
 
         # Status
@@ -51,6 +46,7 @@ class GUIView:
         # Callbacks (los inyecta el Controller)
         self._on_shuffle: Optional[Callable[[], None]] = None
         self._on_solve: Optional[Callable[[], None]] = None
+        self._on_cancel: Optional[Callable[[], None]] = None
 
     def bind_on_shuffle(self, fn: Callable[[], None]):
         self._on_shuffle = fn
@@ -60,26 +56,58 @@ class GUIView:
         self._on_solve = fn
         self.btn_solve.configure(command=fn)
 
+    def bind_on_cancel(self, fn: Callable[[], None]):
+        self._on_cancel = fn
+        self.btn_cancel.configure(command=fn)
+
+    def _crear_fichas(self, n: int):
+        for fila in self.tiles:
+            for lbl in fila:
+                lbl.destroy()
+        # Fichas más pequeñas en tableros grandes para que la ventana quepa
+        tam = 20 if n <= 3 else max(10, 60 // n)
+        self.tiles = [[None]*n for _ in range(n)]  # type: ignore
+        for r in range(n):
+            for c in range(n):
+                lbl = tk.Label(self.grid_frame, text="",
+                               width=4, height=2,
+                               font=("Segoe UI", tam, "bold"),
+                               bd=1, relief="ridge", padx=10, pady=10,
+                               bg="#ffffff")
+                lbl.grid(row=r, column=c, padx=4, pady=4, sticky="nsew")
+                self.tiles[r][c] = lbl
+        self._dibujado = None
+
     # ==== API que usa el Controller ====
     def render(self, board: Tablero, header: str | None = None, movs: int | None = None):
         if header: self.set_status(header)
         if movs is not None:
             self.moves_label.configure(text=f"Movimientos (A*): {movs}")
-            self.moves_label.update_idletasks()
 
+        n = board.n
+        if len(self.tiles) != n:
+            self._crear_fichas(n)
         st = board.state
-        for r in range(3):
-            for c in range(3):
-                v = st[r*3 + c]
-                lbl = self.tiles[r][c]
-                if v == 0:
-                    lbl.configure(text="", bg="#eaeaea")
-                else:
-                    lbl.configure(text=str(v), bg="#c95c5c")
+        antes = self._dibujado
+        for i, v in enumerate(st):
+            # Un movimiento solo cambia dos casillas: las demás no se tocan
+            if antes is not None and antes[i] == v:
+                continue
+            lbl = self.tiles[i // n][i % n]
+            if v == 0:
+                lbl.configure(text="", bg="#eaeaea")
+            else:
+                lbl.configure(text=str(v), bg="#c95c5c")
+        self._dibujado = st
 
     def set_status(self, msg: str):
         self.status.configure(text=msg)
-        self.status.update_idletasks()
+
+    def set_searching(self, activo: bool):
+        """Mientras hay una búsqueda en curso solo se puede cancelar."""
+        self.btn_solve.configure(state="disabled" if activo else "normal")
+        self.btn_shuffle.configure(state="disabled" if activo else "normal")
+        self.btn_cancel.configure(state="normal" if activo else "disabled")
 
     def schedule(self, ms: int, fn: Callable[[], None]):
         self.root.after(ms, fn)
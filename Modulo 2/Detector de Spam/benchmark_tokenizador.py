@@ -0,0 +1,109 @@
+import argparse
+import random
+import re
+import sys
+import time
+from spam import limpiar_texto, stopwords_espanol
+
+# Comprueba que `limpiar_texto` (una pasada de regex) da exactamente los mismos
+# tokens que la versión original con word_tokenize de NLTK, y mide el
+# rendimiento de las dos sobre el mismo corpus.
+#
+#   python benchmark_tokenizador.py --correos 20000
+#   python benchmark_tokenizador.py --csv correos.csv --columna email
+
+PALABRAS = ("gana dinero fácil casa reunión trabajo premio clic aquí oferta increíble ahora "
+            "recuerda hora espera aplica reclamar mañana cuenta banco contraseña urgente gratis "
+            "cannot gonna wanna gimme lemme gotta whatcha whaddya niño año über façade "
+            "x2 100 3pm $$$ 50% e-mail www.ejemplo.com usuario_1 señor@correo.mx ¿qué? ¡ya!").split()
+SEPARADORES = [" ", " ", " ", ", ", ". ", "!!! ", "\n", "\t", " - ", "... ", " (", ") ", "'", "\""]
+
+
+_tokenizador_nltk = None  # el mismo que usa word_tokenize por dentro
+
+
+def limpiar_texto_nltk(texto):
+    """`limpiar_texto` original: lower + re.sub(r'\\W', ' ') + word_tokenize + filtro.
+
+    word_tokenize es Punkt (frases) + NLTKWordTokenizer. Sin puntuación Punkt
+    no parte nada, así que se usa NLTKWordTokenizer directamente: mismos
+    tokens y sin tener que descargar los datos de Punkt.
+    """
+    global _tokenizador_nltk
+    if _tokenizador_nltk is None:
+        from nltk.tokenize import NLTKWordTokenizer
+        _tokenizador_nltk = NLTKWordTokenizer()
+    descartar = stopwords_espanol()
+    texto = texto.lower()
+    texto = re.sub(r'\W', ' ', texto)
+    tokens = _tokenizador_nltk.tokenize(texto)
+    return [word for word in tokens if word not in descartar and len(word) > 1]
+
+
+def correos_sinteticos(n, semilla):
+    """`n` correos al azar con palabras del español, puntuación y casos raros."""
+    rng = random.Random(semilla)
+    vocabulario = PALABRAS + sorted(stopwords_espanol())
+    correos = []
+    for _ in range(n):
+        partes = []
+        for _ in range(rng.randint(0, 120)):
+            palabra = rng.choice(vocabulario)
+            partes.append(palabra.upper() if rng.random() < 0.1 else palabra)
+            partes.append(rng.choice(SEPARADORES))
+        correos.append("".join(partes))
+    return correos
+
+
+def correos_csv(ruta, columna, limite):
+    import pandas as pd
+    serie = pd.read_csv(ruta, usecols=[columna], nrows=limite)[columna]
+    return serie.dropna().astype(str).tolist()
+
+
+def medir(funcion, correos, repeticiones):
+    """Mejor tiempo (s) de `repeticiones` pasadas sobre todos los correos."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for texto in correos:
+            funcion(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Equivalencia y rendimiento del tokenizador de spam.py.")
+    parser.add_argument("--correos", type=int, default=5000, help="correos sintéticos a generar")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--csv", help="usar los correos de este CSV en lugar de los sintéticos")
+    parser.add_argument("--columna", default="email", help="columna de texto del CSV")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        correos = correos_csv(args.csv, args.columna, args.correos)
+    else:
+        correos = correos_sinteticos(args.correos, args.semilla)
+
+    distintos = 0
+    for texto in correos:
+        esperado, obtenido = limpiar_texto_nltk(texto), limpiar_texto(texto)
+        if esperado != obtenido:
+            if not distintos:
+                print(f"Primer correo distinto: {texto!r}\n  nltk:  {esperado}\n  regex: {obtenido}")
+            distintos += 1
+    print(f"Equivalencia: {len(correos) - distintos}/{len(correos)} correos con los mismos tokens")
+
+    megas = sum(len(t.encode("utf-8")) for t in correos) / 1e6
+    t_nltk = medir(limpiar_texto_nltk, correos, args.repeticiones)
+    t_regex = medir(limpiar_texto, correos, args.repeticiones)
+    print(f"{'tokenizador':<12}{'s':>9}{'correos/s':>12}{'MB/s':>9}")
+    for nombre, t in (("nltk", t_nltk), ("regex", t_regex)):
+        print(f"{nombre:<12}{t:>9.3f}{len(correos) / t:>12.0f}{megas / t:>9.2f}")
+    print(f"Aceleración: {t_nltk / t_regex:.1f}x")
+    return 1 if distintos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import argparse
+import email
+import json
+import mailbox
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from email import policy
+from spam import (ModeloNaiveBayes, entrenar_en_flujo, leer_csv, leer_maildir, leer_mbox,
+                  texto_de_mensaje)
+
+# Clasificación masiva de correos sin pasar por la demo de spam.py.
+#
+# `entrenar` guarda un modelo (ver ModeloNaiveBayes.guardar) a partir de un CSV
+# etiquetado y/o de buzones mbox/Maildir de spam y de no spam. `clasificar` lee
+# correos de archivos, directorios o stdin, los reparte en tandas entre un pool
+# de procesos (cada uno carga el modelo una sola vez, con mmap) y escribe un
+# JSON por correo, en el mismo orden de la entrada.
+#
+#   python clasificar.py entrenar --modelo modelo/ --csv correos.csv
+#   python clasificar.py entrenar --modelo modelo/ --spam spam.mbox --no-spam Maildir/
+#   python clasificar.py clasificar --modelo modelo/ buzon.mbox correos/ > veredictos.jsonl
+#   cat asuntos.txt | python clasificar.py clasificar --modelo modelo/ -
+
+# Tandas en vuelo por proceso: suficientes para no dejar procesos parados
+# mientras se escribe la salida, sin leer toda la entrada de golpe
+TANDAS_POR_PROCESO = 2
+
+
+def es_maildir(ruta):
+    return all(os.path.isdir(os.path.join(ruta, sub)) for sub in ('cur', 'new', 'tmp'))
+
+
+def es_mbox(ruta):
+    with open(ruta, 'rb') as f:
+        return f.read(5) == b'From '
+
+
+def leer_correos(rutas, ilegibles):
+    """(id, texto) de cada correo, en orden.
+
+    `-` es stdin con un correo por línea. Un directorio Maildir o un archivo
+    mbox aportan todos sus mensajes; cualquier otro directorio se recorre
+    (en orden alfabético) y cada archivo que no sea mbox es un correo. Las
+    rutas que no se pueden leer se avisan por stderr y se añaden a `ilegibles`.
+    """
+    for ruta in rutas:
+        if ruta == '-':
+            for num, linea in enumerate(sys.stdin, start=1):
+                if linea.strip():
+                    yield f"-:{num}", linea
+        elif os.path.isdir(ruta) and es_maildir(ruta):
+            try:
+                buzon = mailbox.Maildir(ruta, create=False)
+                for clave in sorted(buzon.keys()):
+                    yield f"{ruta}:{clave}", texto_de_mensaje(buzon[clave])
+            except OSError as e:
+                print(f"No se pudo leer {ruta}: {e}", file=sys.stderr)
+                ilegibles.append(ruta)
+        elif os.path.isdir(ruta):
+            for raiz, dirs, archivos in os.walk(ruta):
+                yield from leer_correos((os.path.join(raiz, a) for a in sorted(archivos)), ilegibles)
+                # Los Maildir de dentro se leen como buzones, no archivo por archivo
+                dirs.sort()
+                buzones = [d for d in dirs if es_maildir(os.path.join(raiz, d))]
+                yield from leer_correos((os.path.join(raiz, d) for d in buzones), ilegibles)
+                dirs[:] = [d for d in dirs if d not in buzones]
+        else:
+            try:
+                if es_mbox(ruta):
+                    for i, mensaje in enumerate(mailbox.mbox(ruta, create=False)):
+                        yield f"{ruta}:{i}", texto_de_mensaje(mensaje)
+                else:
+                    with open(ruta, 'rb') as f:
+                        mensaje = email.message_from_binary_file(f, policy=policy.compat32)
+                    yield ruta, texto_de_mensaje(mensaje)
+            except OSError as e:
+                print(f"No se pudo leer {ruta}: {e}", file=sys.stderr)
+                ilegibles.append(ruta)
+
+
+def en_tandas(correos, tam):
+    tanda = []
+    for correo in correos:
+        tanda.append(correo)
+        if len(tanda) == tam:
+            yield tanda
+            tanda = []
+    if tanda:
+        yield tanda
+
+
+# --- Trabajo de cada proceso del pool ---
+_modelo = None
+
+
+def _iniciar_trabajador(ruta_modelo):
+    global _modelo
+    _modelo = ModeloNaiveBayes.cargar(ruta_modelo)
+
+
+def _clasificar_tanda(textos):
+    return [(veredicto, float(s), float(ns)) for veredicto, s, ns in _modelo.clasificar_lote(textos)]
+
+
+def clasificar(args):
+    procesos = args.procesos or os.cpu_count() or 1
+    total = spam = 0
+    ilegibles = []
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                             initargs=(args.modelo,)) as pool:
+        # Se escribe siempre la tanda más antigua: la salida sale en el orden de entrada
+        en_vuelo = deque()
+        for tanda in en_tandas(leer_correos(args.entradas, ilegibles), max(1, args.lote)):
+            ids = [i for i, _ in tanda]
+            en_vuelo.append((ids, pool.submit(_clasificar_tanda, [t for _, t in tanda])))
+            if len(en_vuelo) >= TANDAS_POR_PROCESO * procesos:
+                total, spam = _escribir(*en_vuelo.popleft(), total, spam)
+        while en_vuelo:
+            total, spam = _escribir(*en_vuelo.popleft(), total, spam)
+    transcurrido = time.perf_counter() - inicio
+    print(f"{total} correos ({spam} spam) en {transcurrido:.2f} s: "
+          f"{total / transcurrido if transcurrido else 0:.0f} correos/s ({procesos} procesos)"
+          + (f", {len(ilegibles)} rutas ilegibles" if ilegibles else ""), file=sys.stderr)
+    # Distinto de cero para que un script note que faltaron entradas
+    return 1 if ilegibles else 0
+
+
+def _escribir(ids, futuro, total, spam):
+    for id_correo, (veredicto, s, ns) in zip(ids, futuro.result()):
+        sys.stdout.write(json.dumps({"id": id_correo, "veredicto": veredicto, "log_spam": s,
+                                     "log_no_spam": ns}, ensure_ascii=False) + "\n")
+        spam += veredicto == "Spam"
+    sys.stdout.flush()
+    return total + len(ids), spam
+
+
+def _buzon(ruta, etiqueta, tam_bloque):
+    if os.path.isdir(ruta):
+        return leer_maildir(ruta, etiqueta, tam_bloque)
+    return leer_mbox(ruta, etiqueta, tam_bloque)
+
+
+def entrenar(args):
+    if not (args.csv or args.spam or args.no_spam):
+        print("Hace falta al menos una fuente: --csv, --spam o --no-spam.", file=sys.stderr)
+        return 2
+    inicio = time.perf_counter()
+    modelo = ModeloNaiveBayes()
+    for ruta in args.csv:
+        entrenar_en_flujo(modelo, leer_csv(ruta, args.columna_texto, args.columna_etiqueta, args.bloque))
+    for ruta in args.spam:
+        entrenar_en_flujo(modelo, _buzon(ruta, 1, args.bloque))
+    for ruta in args.no_spam:
+        entrenar_en_flujo(modelo, _buzon(ruta, 0, args.bloque))
+    modelo.guardar(args.modelo)
+    no_spam, spam = modelo.correos_por_clase.astype(int)
+    print(f"Modelo guardado en {args.modelo}: {spam} spam, {no_spam} no spam, "
+          f"{modelo.V} palabras en {time.perf_counter() - inicio:.2f} s", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Entrena y aplica el detector de spam sobre archivos de correo.")
+    sub = parser.add_subparsers(dest="orden", required=True)
+
+    p = sub.add_parser("entrenar", help="entrena un modelo y lo guarda en un directorio")
+    p.add_argument("--modelo", required=True, help="directorio donde guardar el modelo")
+    p.add_argument("--csv", action="append", default=[], help="CSV con columnas de texto y etiqueta 0/1")
+    p.add_argument("--columna-texto", default="email")
+    p.add_argument("--columna-etiqueta", default="spam")
+    p.add_argument("--spam", action="append", default=[], help="mbox o Maildir con solo spam")
+    p.add_argument("--no-spam", action="append", default=[], help="mbox o Maildir sin spam")
+    p.add_argument("--bloque", type=int, default=10000, help="correos por bloque de partial_fit")
+    p.set_defaults(funcion=entrenar)
+
+    p = sub.add_parser("clasificar", help="clasifica correos con un modelo guardado (JSONL en stdout)")
+    p.add_argument("--modelo", required=True, help="directorio de un modelo guardado con `entrenar`")
+    p.add_argument("entradas", nargs="*", default=["-"],
+                   help="archivos, directorios o - para stdin (un correo por línea); por defecto stdin")
+    p.add_argument("--procesos", type=int, default=None,
+                   help="procesos del pool (por defecto, uno por CPU)")
+    p.add_argument("--lote", type=int, default=256, help="correos que se envían juntos a cada proceso")
+    p.set_defaults(funcion=clasificar)
+
+    args = parser.parse_args(argv)
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,143 +1,380 @@
 # Integrantes: Grande Espinoza Victor Ramon, Ana Jasmin Torres.
-import pandas as pd
+import mailbox
+import os
 import re
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from collections import Counter
 import numpy as np
+from scipy import sparse
 
-# --- 1. Descarga de recursos y configuración ---
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.data.find('tokenizers/punkt')
-nltk.data.find('corpora/stopwords')
-    
+# --- 1. Stopwords ---
+# Requisito: `limpiar_texto` (y todo lo que entrena o clasifica con él)
+# necesita NLTK instalado y su corpus de stopwords, que se descarga la primera
+# vez (con red) si no está. La única excepción es haber cargado antes un modelo
+# con `ModeloNaiveBayes.cargar`: trae sus propias stopwords y NLTK ni se importa.
+SPANISH_STOPWORDS = None  # frozenset, ver `stopwords_espanol`
+
+
+def stopwords_espanol():
+    """Stopwords en español de NLTK; el corpus se descarga solo si falta."""
+    global SPANISH_STOPWORDS
+    if SPANISH_STOPWORDS is None:
+        try:
+            import nltk
+            from nltk.corpus import stopwords
+        except ImportError as e:
+            raise ImportError("limpiar_texto necesita NLTK para las stopwords (pip install nltk), "
+                              "salvo que antes se cargue un modelo guardado.") from e
+        try:
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            nltk.download('stopwords')
+        SPANISH_STOPWORDS = frozenset(stopwords.words('spanish'))
+    return SPANISH_STOPWORDS
 
-# Definir las stopwords en español
-SPANISH_STOPWORDS = set(stopwords.words('spanish'))
 
 # --- 2. Método para el preprocesamiento de datos (Mejorado) ---
+# Antes: lower + re.sub(r'\W', ' ') + word_tokenize de NLTK + filtro. Tras la
+# sustitución solo quedan palabras separadas por espacios, así que basta una
+# pasada de regex que además descarta los tokens de una sola letra. Lo único
+# que word_tokenize partía dentro de una palabra son estas contracciones del
+# inglés; se parten igual para dar exactamente los mismos tokens.
+_PALABRA = re.compile(r'\w{2,}')
+_CONTRACCIONES = {
+    'cannot': ('can', 'not'), 'gimme': ('gim', 'me'), 'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'), 'lemme': ('lem', 'me'), 'wanna': ('wan', 'na'),
+}
+
+
 def limpiar_texto(texto):
     """Limpia, tokeniza y elimina stop words."""
-    texto = texto.lower() 
-    # Eliminar caracteres no alfanuméricos y reemplazarlos por espacio
-    texto = re.sub(r'\W', ' ', texto) 
-    tokens = word_tokenize(texto) 
-    
-    # Filtrar stop words y tokens de una sola letra
-    tokens = [word for word in tokens if word not in SPANISH_STOPWORDS and len(word) > 1]
-    return tokens
-
-# --- 3. Datos de ejemplo y Preprocesamiento ---
-data = {'email': ['Gana dinero fácil $$$ desde casa!!!',
-                  'Reunión de trabajo a las 3 PM.',
-                  'Gana dinero fácil $$$ desde casa!!!',
-                  'Haz clic aquí para reclamar tu premio!',
-                  'Tu trabajo te espera, aplica ahora',
-                  'Recuerda la hora de la reunión'],
-        'spam': [1, 0, 1, 1, 1, 0]}
-df = pd.DataFrame(data)
-
-# Eliminar correos electrónicos duplicados
-df = df.drop_duplicates(subset=['email'])
-
-# Aplicar limpieza y preprocesamiento
-df['tokens'] = df['email'].apply(limpiar_texto)
-
-# --- 4. Cálculo de Probabilidades Previas (P(Spam)) ---
-num_spam = df['spam'].sum()
-total_correos = len(df)
-P_spam = num_spam / total_correos
-P_no_spam = 1 - P_spam 
-
-# Separar tokens
-spam_tokens = [word for tokens in df[df['spam'] == 1]['tokens'] for word in tokens]
-no_spam_tokens = [word for tokens in df[df['spam'] == 0]['tokens'] for word in tokens]
-
-# Contar frecuencia de palabras
-spam_counts = Counter(spam_tokens)
-no_spam_counts = Counter(no_spam_tokens)
-
-# Vocabulario total (para el suavizado de Laplace)
-vocabulario_total = set(spam_tokens + no_spam_tokens)
-V = len(vocabulario_total)
-
-# Totales de palabras en cada clase
-total_spam_words = len(spam_tokens)
-total_no_spam_words = len(no_spam_tokens)
-
-# --- 5. Cálculo de Log-Probabilidades (P(Palabra | Clase)) ---
-# El suavizado de Laplace se implementa aquí: (Count + 1) / (Total_Words + V)
-
-# Función auxiliar para obtener el Logaritmo de P(Palabra | Clase)
-def get_log_prob(word, counts, total_words, V):
-    """Calcula log(P(Palabra | Clase)) con suavizado de Laplace."""
-    # Frecuencia de la palabra + 1 (suavizado)
-    frecuencia = counts.get(word, 0) + 1 
-    # Denominador (Total de palabras en la clase + tamaño del vocabulario)
-    denominador = total_words + V 
-    return np.log(frecuencia / denominador)
-
-# Calcular las log-probabilidades para el vocabulario completo
-log_prob_spam_words = {word: get_log_prob(word, spam_counts, total_spam_words, V) for word in vocabulario_total}
-log_prob_no_spam_words = {word: get_log_prob(word, no_spam_counts, total_no_spam_words, V) for word in vocabulario_total}
-
-
-# --- 6. Función de Clasificación (Usando Logaritmos) ---
-def clasificar_correo(texto):
-    """Clasifica el correo usando Log-Probabilidades para evitar underflow."""
-    palabras = limpiar_texto(texto)
-    
-    # Inicializar el cálculo con el logaritmo de la probabilidad previa
-    log_P_spam_score = np.log(P_spam) 
-    log_P_no_spam_score = np.log(P_no_spam)
-    
-    # Log-Probabilidad para palabras no vistas (usando el suavizado de Laplace)
-    # log(1 / (Total_Words + V))
-    log_prob_desconocida_spam = np.log(1 / (total_spam_words + V))
-    log_prob_desconocida_no_spam = np.log(1 / (total_no_spam_words + V))
-
-    for word in palabras:
-        # Sumamos los logaritmos de las probabilidades condicionales (P(palabra | Clase))
-        log_P_spam_score += log_prob_spam_words.get(word, log_prob_desconocida_spam)
-        log_P_no_spam_score += log_prob_no_spam_words.get(word, log_prob_desconocida_no_spam)
-    
-    # La clasificación se basa en qué score logarítmico es mayor.
-    if log_P_spam_score > log_P_no_spam_score:
-        return "Spam", log_P_spam_score, log_P_no_spam_score
-    else:
-        return "No Spam", log_P_spam_score, log_P_no_spam_score
-
-
-# --- 7. Resultados y Evaluación ---
-
-# Ejemplo de prueba:
-nuevo_email = "Gana dinero ahora con esta increíble oferta"
-resultado, log_spam, log_nospam = clasificar_correo(nuevo_email)
-
-print(df[['email', 'spam', 'tokens']])
-print("--------------------------------------------------")
-print(f"Probabilidad previa de Spam (P(Spam)): {P_spam:.2f}")
-
-print("\n--- Ejemplo de Clasificación (Log-Probabilidades) ---")
-print(f"Nuevo Correo: '{nuevo_email}'")
-print(f"Log Score (Spam): {log_spam:.4f}")
-print(f"Log Score (No Spam): {log_nospam:.4f}")
-print(f"➡ Clasificación: {resultado}")
-
-# Para obtener la probabilidad real P(Spam | Características) se usa Softmax (o logsumexp)
-# Esto es opcional, pero da un resultado más interpretable:
-import scipy.special
-prob_real_spam = np.exp(log_spam) / (np.exp(log_spam) + np.exp(log_nospam))
-print(f"Probabilidad de que sea spam (Softmax): {prob_real_spam:.4f}")
-
-# Evaluación (Nota: La precisión será alta en este pequeño set de entrenamiento)
-clasificaciones_predichas = np.array([clasificar_correo(correo)[0] == 'Spam' for correo in df['email']])
-etiquetas_reales = df['spam'].values.astype(bool)
-
-from sklearn.metrics import accuracy_score, recall_score, precision_score
-
-print("\n--- Métricas de Evaluación ---")
-print(f"Accuracy (Precisión Total): {accuracy_score(etiquetas_reales, clasificaciones_predichas):.4f}")
-print(f"Recall (Sensibilidad, detectando Spam): {recall_score(etiquetas_reales, clasificaciones_predichas):.4f}")
\ No newline at end of file
+    palabras = _PALABRA.findall(texto.lower())
+    if not _CONTRACCIONES.keys().isdisjoint(palabras):
+        palabras = [p for word in palabras for p in _CONTRACCIONES.get(word, (word,))]
+    descartar = SPANISH_STOPWORDS or stopwords_espanol()
+    return [word for word in palabras if word not in descartar]
+
+
+# --- 3. Modelo Naive Bayes vectorizado ---
+# Cada palabra del vocabulario tiene un índice de columna. Los correos se
+# convierten en una matriz dispersa documento-término (conteos) y las
+# log-probabilidades P(Palabra | Clase) viven en un único array (2, V):
+# fila 0 = No Spam, fila 1 = Spam. Así clasificar miles de correos es un solo
+# producto de matriz dispersa por matriz densa.
+class ModeloNaiveBayes:
+    """Naive Bayes multinomial con suavizado de Laplace sobre un índice de vocabulario.
+
+    Se puede entrenar de una vez (`entrenar`) o por bloques (`partial_fit`):
+    solo se acumulan los conteos por clase, así que la memoria depende del
+    tamaño del vocabulario y no del número de correos vistos. Las
+    log-probabilidades se recalculan cuando hacen falta para clasificar.
+    """
+
+    def __init__(self):
+        self.vocabulario = {}                # palabra -> columna
+        self._conteos = np.zeros((2, 1024))  # con columnas de reserva para crecer
+        self.correos_por_clase = np.zeros(2)
+        self._sucio = True                   # hay conteos nuevos sin log-probabilidades
+
+    @property
+    def V(self):
+        return len(self.vocabulario)
+
+    @property
+    def conteos(self):
+        """conteos[c, j] = apariciones de la palabra j en la clase c, shape (2, V)."""
+        return self._conteos[:, :self.V]
+
+    def matriz(self, documentos, ampliar=False):
+        """Matriz dispersa (N, V) de conteos y, aparte, cuántos tokens de cada
+        documento no están en el vocabulario. Con `ampliar` las palabras nuevas
+        se añaden al vocabulario."""
+        vocabulario = self.vocabulario
+        indices, indptr, desconocidas = [], [0], []
+        for tokens in documentos:
+            fuera = 0
+            for word in tokens:
+                j = vocabulario.get(word)
+                if j is None:
+                    if not ampliar:
+                        fuera += 1
+                        continue
+                    j = vocabulario[word] = len(vocabulario)
+                indices.append(j)
+            indptr.append(len(indices))
+            desconocidas.append(fuera)
+        X = sparse.csr_matrix((np.ones(len(indices)), indices, indptr),
+                              shape=(len(indptr) - 1, len(vocabulario)))
+        X.sum_duplicates()
+        return X, np.array(desconocidas, dtype=float)
+
+    def partial_fit(self, documentos, etiquetas):
+        """Suma los conteos de un bloque de documentos (etiquetas 1 = spam, 0 = no spam)."""
+        # Se valida antes de `matriz`, que ya mete las palabras nuevas en el vocabulario
+        documentos = list(documentos)
+        y = np.asarray(etiquetas)
+        if y.ndim != 1:
+            raise ValueError("Las etiquetas tienen que ser una secuencia de 0 y 1, una por documento.")
+        if len(y) != len(documentos):
+            raise ValueError(f"Hace falta una etiqueta por documento: hay {len(documentos)} "
+                             f"documentos y {len(y)} etiquetas.")
+        validas = np.isin(y, (0, 1))
+        if not validas.all():
+            raise ValueError(f"Etiqueta {y[~validas][0].item()!r} no válida; solo se admiten "
+                             f"0 (no spam) y 1 (spam).")
+        y = y.astype(int)
+        X, _ = self.matriz(documentos, ampliar=True)
+        if self.V > self._conteos.shape[1] or not self._conteos.flags.writeable:
+            # Crecer al doble: copiar es amortizado O(1) por palabra nueva.
+            # Un modelo cargado con `cargar` tiene los conteos en solo lectura.
+            mas = np.zeros((2, max(self.V, 2 * self._conteos.shape[1])))
+            mas[:, :self._conteos.shape[1]] = self._conteos
+            self._conteos = mas
+        # Una fila indicadora por clase: conteos del bloque = Y @ X, shape (2, V)
+        Y = sparse.csr_matrix((np.ones(len(y)), (y, np.arange(len(y)))), shape=(2, len(y)))
+        self._conteos[:, :self.V] += (Y @ X).toarray()
+        self.correos_por_clase += np.bincount(y, minlength=2)
+        self._sucio = True
+        return self
+
+    def entrenar(self, documentos, etiquetas):
+        """Entrena desde cero con todos los documentos."""
+        self.__init__()
+        return self.partial_fit(documentos, etiquetas)
+
+    def _calcular_log_probs(self):
+        if not self._sucio:
+            return
+        # El suavizado de Laplace se implementa aquí: (Count + 1) / (Total_Words + V)
+        conteos = self.conteos
+        denominador = conteos.sum(axis=1, keepdims=True) + self.V
+        self._log_probs = np.log(conteos + 1) - np.log(denominador)
+        self._log_desconocida = -np.log(denominador[:, 0])
+        self._log_previas = np.log(self.correos_por_clase / self.correos_por_clase.sum())
+        self._sucio = False
+
+    @property
+    def log_probs(self):
+        """log P(Palabra | Clase), shape (2, V)."""
+        self._calcular_log_probs()
+        return self._log_probs
+
+    @property
+    def log_desconocida(self):
+        """log P(palabra no vista | Clase), shape (2,)."""
+        self._calcular_log_probs()
+        return self._log_desconocida
+
+    @property
+    def log_previas(self):
+        """log P(Clase), shape (2,)."""
+        self._calcular_log_probs()
+        return self._log_previas
+
+    def guardar(self, ruta):
+        """Guarda el modelo en el directorio `ruta`: un .npy por array y el
+        vocabulario en `vocabulario.txt` (UTF-8, una palabra por línea, en orden
+        de columna)."""
+        os.makedirs(ruta, exist_ok=True)
+        palabras = [None] * self.V
+        for word, j in self.vocabulario.items():
+            palabras[j] = word
+        with open(os.path.join(ruta, 'vocabulario.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(palabras))
+        with open(os.path.join(ruta, 'stopwords.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(sorted(stopwords_espanol())))
+        for nombre in ('conteos', 'correos_por_clase', 'log_probs', 'log_desconocida', 'log_previas'):
+            np.save(os.path.join(ruta, nombre + '.npy'), getattr(self, nombre))
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Modelo guardado con `guardar`. Los arrays grandes se mapean con mmap
+        (solo se leen las páginas que se usan y varios procesos comparten las
+        mismas) y las log-probabilidades ya vienen calculadas. Si aún no hay
+        stopwords, se usan las guardadas con el modelo y NLTK no se importa."""
+        global SPANISH_STOPWORDS
+        modelo = cls()
+        if SPANISH_STOPWORDS is None and os.path.exists(os.path.join(ruta, 'stopwords.txt')):
+            with open(os.path.join(ruta, 'stopwords.txt'), encoding='utf-8') as f:
+                SPANISH_STOPWORDS = frozenset(f.read().split())
+        with open(os.path.join(ruta, 'vocabulario.txt'), encoding='utf-8') as f:
+            contenido = f.read()
+        palabras = contenido.split('\n') if contenido else []
+        modelo.vocabulario = dict(zip(palabras, range(len(palabras))))
+        modelo._conteos = np.load(os.path.join(ruta, 'conteos.npy'), mmap_mode='r')
+        modelo.correos_por_clase = np.load(os.path.join(ruta, 'correos_por_clase.npy'))
+        modelo._log_probs = np.load(os.path.join(ruta, 'log_probs.npy'), mmap_mode='r')
+        modelo._log_desconocida = np.load(os.path.join(ruta, 'log_desconocida.npy'))
+        modelo._log_previas = np.load(os.path.join(ruta, 'log_previas.npy'))
+        modelo._sucio = False
+        return modelo
+
+    def puntuar(self, documentos):
+        """Array (N, 2) con [log score No Spam, log score Spam] de cada documento."""
+        if not self.correos_por_clase.sum():
+            raise ValueError("El modelo no está entrenado: llama a `entrenar` o `partial_fit` "
+                             "antes de clasificar.")
+        X, desconocidas = self.matriz(documentos)
+        return (X @ self.log_probs.T + np.outer(desconocidas, self.log_desconocida)
+                + self.log_previas)
+
+    def clasificar_lote(self, textos):
+        """[(veredicto, log score Spam, log score No Spam)] de cada texto."""
+        scores = self.puntuar([limpiar_texto(t) for t in textos])
+        return [("Spam" if s > ns else "No Spam", s, ns) for ns, s in scores]
+
+
+# --- 4. Fuentes de correo para entrenar por bloques ---
+# Cada lector devuelve bloques (textos, etiquetas) de como mucho `tam_bloque`
+# correos, sin cargar nunca la fuente entera en memoria.
+def texto_de_mensaje(mensaje):
+    """Asunto y partes de texto plano de un `email.message.Message`."""
+    partes = [mensaje.get('Subject', '') or '']
+    for parte in mensaje.walk():
+        if parte.get_content_type() != 'text/plain':
+            continue
+        cuerpo = parte.get_payload(decode=True)
+        if cuerpo is None:
+            continue
+        partes.append(cuerpo.decode(parte.get_content_charset() or 'utf-8', errors='replace'))
+    return '\n'.join(partes)
+
+
+def _en_bloques(pares, tam_bloque):
+    textos, etiquetas = [], []
+    for texto, etiqueta in pares:
+        textos.append(texto)
+        etiquetas.append(etiqueta)
+        if len(textos) == tam_bloque:
+            yield textos, etiquetas
+            textos, etiquetas = [], []
+    if textos:
+        yield textos, etiquetas
+
+
+def leer_csv(ruta, columna_texto='email', columna_etiqueta='spam', tam_bloque=10000):
+    """Bloques de un CSV con una columna de texto y otra de etiqueta 0/1.
+
+    Se saltan las filas a las que les falta el texto o la etiqueta; una
+    etiqueta que no sea 0 ni 1 es un ValueError que dice en qué línea está.
+    """
+    import pandas as pd
+    for bloque in pd.read_csv(ruta, usecols=[columna_texto, columna_etiqueta],
+                              chunksize=tam_bloque):
+        bloque = bloque.dropna(subset=[columna_texto, columna_etiqueta])
+        etiquetas = bloque[columna_etiqueta]
+        validas = etiquetas.isin([0, 1])
+        if not validas.all():
+            fila = etiquetas.index[~validas][0]
+            # +2: la cabecera y que el índice de pandas empieza en 0
+            raise ValueError(f"{ruta}, línea {fila + 2}: etiqueta '{etiquetas[fila]}' en la columna "
+                             f"'{columna_etiqueta}'; solo se admiten 0 (no spam) y 1 (spam).")
+        yield bloque[columna_texto].astype(str).tolist(), etiquetas.astype(int).tolist()
+
+
+def leer_mbox(ruta, etiqueta, tam_bloque=10000):
+    """Bloques de un archivo mbox cuyos correos son todos de la clase `etiqueta`."""
+    return _en_bloques(((texto_de_mensaje(m), etiqueta) for m in mailbox.mbox(ruta, create=False)),
+                       tam_bloque)
+
+
+def leer_maildir(ruta, etiqueta, tam_bloque=10000):
+    """Bloques de un directorio Maildir cuyos correos son todos de la clase `etiqueta`."""
+    return _en_bloques(((texto_de_mensaje(m), etiqueta) for m in mailbox.Maildir(ruta, create=False)),
+                       tam_bloque)
+
+
+def entrenar_en_flujo(modelo, bloques):
+    """Pasa al modelo, con `partial_fit`, cada bloque (textos, etiquetas) de una fuente."""
+    for textos, etiquetas in bloques:
+        modelo.partial_fit([limpiar_texto(t) for t in textos], etiquetas)
+    return modelo
+
+
+# --- 5. Función de Clasificación (Usando Logaritmos) ---
+# Datos de ejemplo: la demo y el modelo por defecto cuando no hay uno guardado
+DATOS_EJEMPLO = {'email': ['Gana dinero fácil $$$ desde casa!!!',
+                           'Reunión de trabajo a las 3 PM.',
+                           'Gana dinero fácil $$$ desde casa!!!',
+                           'Haz clic aquí para reclamar tu premio!',
+                           'Tu trabajo te espera, aplica ahora',
+                           'Recuerda la hora de la reunión'],
+                 'spam': [1, 0, 1, 1, 1, 0]}
+
+# Directorio donde `clasificar_correo` busca un modelo guardado (ver `guardar`)
+RUTA_MODELO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modelo')
+_modelo_por_defecto = None
+
+
+def modelo_por_defecto():
+    """El modelo guardado en RUTA_MODELO o, si no hay, uno entrenado con los
+    datos de ejemplo (sin duplicados). Se construye una sola vez."""
+    global _modelo_por_defecto
+    if _modelo_por_defecto is None:
+        if os.path.exists(os.path.join(RUTA_MODELO, 'vocabulario.txt')):
+            _modelo_por_defecto = ModeloNaiveBayes.cargar(RUTA_MODELO)
+        else:
+            ejemplos = {}
+            for email, etiqueta in zip(DATOS_EJEMPLO['email'], DATOS_EJEMPLO['spam']):
+                ejemplos.setdefault(email, etiqueta)
+            _modelo_por_defecto = ModeloNaiveBayes().entrenar(
+                [limpiar_texto(t) for t in ejemplos], list(ejemplos.values()))
+    return _modelo_por_defecto
+
+
+def clasificar_correo(texto, modelo=None):
+    """Clasifica el correo usando Log-Probabilidades para evitar underflow.
+
+    Sin `modelo` se usa `modelo_por_defecto()`.
+    """
+    if modelo is None:
+        modelo = modelo_por_defecto()
+    return modelo.clasificar_lote([texto])[0]
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    # --- 6. Datos de ejemplo y Preprocesamiento ---
+    df = pd.DataFrame(DATOS_EJEMPLO)
+
+    # Eliminar correos electrónicos duplicados
+    df = df.drop_duplicates(subset=['email'])
+
+    # Aplicar limpieza y preprocesamiento
+    df['tokens'] = df['email'].apply(limpiar_texto)
+
+    # --- 7. Entrenamiento ---
+    modelo = ModeloNaiveBayes().entrenar(df['tokens'], df['spam'])
+    P_spam = np.exp(modelo.log_previas[1])
+
+    # --- 8. Resultados y Evaluación ---
+
+    # Ejemplo de prueba:
+    nuevo_email = "Gana dinero ahora con esta increíble oferta"
+    resultado, log_spam, log_nospam = clasificar_correo(nuevo_email, modelo)
+
+    print(df[['email', 'spam', 'tokens']])
+    print("--------------------------------------------------")
+    print(f"Probabilidad previa de Spam (P(Spam)): {P_spam:.2f}")
+
+    print("\n--- Ejemplo de Clasificación (Log-Probabilidades) ---")
+    print(f"Nuevo Correo: '{nuevo_email}'")
+    print(f"Log Score (Spam): {log_spam:.4f}")
+    print(f"Log Score (No Spam): {log_nospam:.4f}")
+    print(f"➡ Clasificación: {resultado}")
+
+    # Para obtener la probabilidad real P(Spam | Características) se usa Softmax (o logsumexp)
+    # Esto es opcional, pero da un resultado más interpretable:
+    import scipy.special
+    prob_real_spam = np.exp(log_spam) / (np.exp(log_spam) + np.exp(log_nospam))
+    print(f"Probabilidad de que sea spam (Softmax): {prob_real_spam:.4f}")
+
+    # Evaluación (Nota: La precisión será alta en este pequeño set de entrenamiento)
+    # Todo el conjunto se clasifica de una vez con un solo producto de matrices
+    clasificaciones_predichas = np.array([r[0] == 'Spam' for r in modelo.clasificar_lote(df['email'])])
+    etiquetas_reales = df['spam'].values.astype(bool)
+
+    from sklearn.metrics import accuracy_score, recall_score, precision_score
+
+    print("\n--- Métricas de Evaluación ---")
+    print(f"Accuracy (Precisión Total): {accuracy_score(etiquetas_reales, clasificaciones_predichas):.4f}")
+    print(f"Recall (Sensibilidad, detectando Spam): {recall_score(etiquetas_reales, clasificaciones_predichas):.4f}")
\ No newline at end of file